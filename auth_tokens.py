@@ -0,0 +1,54 @@
+# auth_tokens.py
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+TOKEN_MAX_AGE = 7 * 24 * 3600 # Segundos até o token expirar e o cliente precisar logar de novo
+CACHE_SIZE = 10000            # Tokens já validados mantidos em memória
+
+class InvalidToken(Exception):
+    pass
+
+class TokenAuthority:
+    """
+    Emite e valida tokens de login assinados (itsdangerous, HMAC + carimbo de tempo).
+
+    O token carrega o id e o nome do usuário, então validar não toca no banco:
+    é uma verificação de HMAC. Os tokens já validados ficam num LRU em memória
+    com o instante em que expiram, e as requisições seguintes com o mesmo token
+    custam só uma consulta ao dicionário.
+    """
+    def __init__(self, secret_key, max_age=TOKEN_MAX_AGE, cache_size=CACHE_SIZE):
+        self.max_age = max_age
+        self.cache_size = cache_size
+        self._serializer = URLSafeTimedSerializer(secret_key, salt="auth-token")
+        self._cache = OrderedDict() # token -> (user_id, username, expira_em)
+        self._lock = Lock()
+
+    def issue(self, user_id, username):
+        return self._serializer.dumps({'id': user_id, 'u': username})
+
+    def verify(self, token):
+        """Retorna (user_id, username) ou levanta InvalidToken."""
+        now = time.time()
+        with self._lock:
+            cached = self._cache.get(token)
+            if cached is not None:
+                if cached[2] > now:
+                    self._cache.move_to_end(token)
+                    return cached[0], cached[1]
+                del self._cache[token]
+        try:
+            payload, signed_at = self._serializer.loads(token, max_age=self.max_age, return_timestamp=True)
+            user_id, username = payload['id'], payload['u']
+        except SignatureExpired as e:
+            raise InvalidToken("Token expirado") from e
+        except (BadSignature, TypeError, KeyError) as e:
+            raise InvalidToken("Token inválido") from e
+        with self._lock:
+            self._cache[token] = (user_id, username, signed_at.timestamp() + self.max_age)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False) # Menos usado recentemente
+        return user_id, username
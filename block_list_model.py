@@ -0,0 +1,124 @@
+# block_list_model.py
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+MAX_REMOVE_RANGES = 64 # Acima disso, remover em trechos sai mais caro que um reset do modelo
+
+class BlockListModel(QAbstractListModel):
+    """
+    Modelo das listas de sites e apps bloqueados, para uso com um QListView.
+
+    Os itens ficam numa lista Python simples (ordem de inserção) e num set para
+    checar duplicatas em O(1); a view só pede os textos das linhas visíveis, ao
+    contrário do QListWidget, que cria um QListWidgetItem por entrada. Inserções
+    e remoções são feitas em lote, com um único sinal por trecho de linhas.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._members = set()
+        self._filter = ""
+        self._rows = self._items # Linhas visíveis: a própria _items quando não há filtro
+        self._snapshot = None    # Cache de items(), descartado a cada alteração
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid() and index.row() < len(self._rows):
+            return self._rows[index.row()]
+        return None
+
+    def items(self):
+        """Tupla com todos os itens (ignorando o filtro), em cache até a próxima alteração."""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._items)
+        return self._snapshot
+
+    def item_at(self, row):
+        return self._rows[row]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._members
+
+    def add_items(self, items):
+        """Adiciona os itens que ainda não estão na lista. Retorna a lista dos que entraram."""
+        added = []
+        for item in items:
+            if item and item not in self._members:
+                self._members.add(item)
+                added.append(item)
+        if not added:
+            return added
+        self._snapshot = None
+        if self._rows is self._items:
+            self._append_rows(added)
+        else:
+            self._items.extend(added)
+            self._append_rows([item for item in added if self._filter in item.lower()])
+        return added
+
+    def _append_rows(self, new_rows):
+        if not new_rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self._rows.extend(new_rows)
+        self.endInsertRows()
+
+    def remove_items(self, items):
+        """Remove os itens dados (os que não estiverem na lista são ignorados). Retorna quantos saíram."""
+        doomed = {item for item in items if item in self._members}
+        if not doomed:
+            return 0
+        self._members -= doomed
+        self._snapshot = None
+
+        # Agrupa as linhas visíveis removidas em trechos contíguos [primeira, última]
+        ranges = []
+        for row, item in enumerate(self._rows):
+            if item in doomed:
+                if ranges and ranges[-1][1] == row - 1:
+                    ranges[-1][1] = row
+                else:
+                    ranges.append([row, row])
+        if len(ranges) > MAX_REMOVE_RANGES:
+            self.beginResetModel()
+            self._rows[:] = [item for item in self._rows if item not in doomed]
+            self.endResetModel()
+        else:
+            # De trás para frente, para os índices dos trechos seguintes continuarem válidos
+            for first, last in reversed(ranges):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del self._rows[first:last + 1]
+                self.endRemoveRows()
+        if self._rows is not self._items:
+            self._items[:] = [item for item in self._items if item not in doomed]
+        return len(doomed)
+
+    def clear(self):
+        self.beginResetModel()
+        self._items.clear()
+        self._members.clear()
+        self._rows = [] if self._filter else self._items
+        self._snapshot = None
+        self.endResetModel()
+
+    def set_filter(self, text):
+        """
+        Mostra só os itens que contêm `text`. Se o novo texto contém o anterior
+        (usuário continuou digitando), basta refiltrar as linhas já visíveis.
+        """
+        text = text.strip().lower()
+        if text == self._filter:
+            return
+        self.beginResetModel()
+        if not text:
+            self._rows = self._items
+        else:
+            source = self._rows if self._filter and self._filter in text else self._items
+            self._rows = [item for item in source if text in item.lower()]
+        self._filter = text
+        self.endResetModel()
@@ -0,0 +1,30 @@
+# build_assets.py
+"""
+Gera, uma única vez no build, os arquivos derivados da animação:
+
+    data/hourglass.json  ->  data/hourglass.min.js
+
+O .min.js é o JSON minificado embrulhado em `window.HOURGLASS_ANIMATION = ...;`.
+O lottie_player.html o carrega com uma tag <script>, então abrir a janela não
+faz nenhum trabalho de JSON no Python e nada passa por runJavaScript.
+
+Execute novamente sempre que data/hourglass.json mudar:  python build_assets.py
+"""
+import json
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(BASE_DIR, "data", "hourglass.json")
+TARGET = os.path.join(BASE_DIR, "data", "hourglass.min.js")
+
+def build_animation_script(source=SOURCE, target=TARGET):
+    with open(source, 'r', encoding='utf-8') as f:
+        animation_data = json.load(f)
+    minified = json.dumps(animation_data, separators=(',', ':'), ensure_ascii=True)
+    with open(target, 'w', encoding='utf-8') as f:
+        f.write(f"window.HOURGLASS_ANIMATION = {minified};\n")
+    return os.path.getsize(source), os.path.getsize(target)
+
+if __name__ == '__main__':
+    source_size, target_size = build_animation_script()
+    print(f"{os.path.relpath(TARGET, BASE_DIR)}: {source_size} -> {target_size} bytes")
@@ -0,0 +1,139 @@
+# load_test.py
+"""
+Load test for the sync server. Simulates N rooms with two partners each:
+both join, one partner long-polls /room_status?since=<version>, both start,
+and we measure how long the waiting partner takes to see "running".
+
+By default it spawns sync_api_async.py on a free local port (one process,
+one core). Point --url at an already running server to test another one.
+
+    python load_test.py --rooms 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection speaking just enough to talk JSON."""
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode() + body)
+        await self.writer.drain()
+        raw_head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = raw_head.decode('latin-1').split("\r\n")
+        status = int(lines[0].split(" ")[1])
+        length = 0
+        for line in lines[1:]:
+            if line.lower().startswith("content-length:"):
+                length = int(line.split(":", 1)[1])
+        data = json.loads(await self.reader.readexactly(length))
+        return status, data
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def run_room(index, host, port, stats):
+    room_name = f"load-room-{index}"
+    a, b = Connection(host, port), Connection(host, port)
+    await a.open(); await b.open()
+    try:
+        await a.request("POST", "/join_room", {"room_name": room_name, "user_id": "a"})
+        status, room = await b.request("POST", "/join_room", {"room_name": room_name, "user_id": "b"})
+        assert status == 200, room
+
+        # Partner A waits for the room to change while B starts, then A starts
+        watcher = asyncio.ensure_future(
+            a.request("GET", f"/room_status?room_name={room_name}&since={room['version']}")
+        )
+        await b.request("POST", "/start_timer", {"room_name": room_name, "user_id": "b", "duration_seconds": 60})
+        await watcher
+
+        status, room = await b.request("GET", f"/room_status?room_name={room_name}")
+        watcher = asyncio.ensure_future(
+            b.request("GET", f"/room_status?room_name={room_name}&since={room['version']}")
+        )
+        started = time.perf_counter()
+        await a.request("POST", "/start_timer", {"room_name": room_name, "user_id": "a", "duration_seconds": 60})
+        status, room = await watcher
+        stats["push_latencies"].append(time.perf_counter() - started)
+        assert room["status"] == "running", room
+        stats["requests"] += 7
+    finally:
+        a.close(); b.close()
+
+
+async def run(url, rooms, concurrency):
+    parts = urlsplit(url)
+    stats = {"requests": 0, "push_latencies": []}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(i):
+        async with semaphore:
+            await run_room(i, parts.hostname, parts.port, stats)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited(i) for i in range(rooms)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(stats["push_latencies"])
+    print(f"rooms: {rooms}  (up to {concurrency} concurrently, {2 * concurrency} open connections)")
+    print(f"requests: {stats['requests']} in {elapsed:.2f}s -> {stats['requests'] / elapsed:.0f} req/s")
+    print(f"start -> partner sees 'running': p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Sync server load test")
+    parser.add_argument('--url', help="Existing server, e.g. http://127.0.0.1:5000 (default: spawn sync_api_async.py)")
+    parser.add_argument('--rooms', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=2000, help="Rooms in flight at the same time")
+    args = parser.parse_args()
+
+    # Two sockets per room on our side (and two on the server's if spawned locally)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    server = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        server_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sync_api_async.py")
+        server = subprocess.Popen([sys.executable, server_path, "--host", "127.0.0.1", "--port", str(port)])
+        for _ in range(50):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+    try:
+        asyncio.run(run(url, args.rooms, args.concurrency))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
@@ -1,14 +1,99 @@
 # server.py
 from flask import Flask, request, jsonify
-from threading import Lock
+from threading import Lock, Condition, Thread
+from collections import OrderedDict
 import time
 
 MAX_CONNECTIONS = 2
+LONG_POLL_TIMEOUT = 25 # Max seconds a /room_status?since= request waits for a change
+
+# --- Room expiry ---
+MAX_ROOMS = 10000          # Beyond this, the least recently used room is evicted
+USER_TTL = 90              # A user with no request for this long is dropped (> LONG_POLL_TIMEOUT)
+FINISHED_ROOM_TTL = 60     # Cancelled/finished rooms linger this long so partners see the final state
+SWEEP_INTERVAL = 15        # Seconds between background sweeps
 
 app = Flask(__name__)
 
-rooms = {}
+rooms = OrderedDict() # Ordered by last access, for LRU eviction
 lock = Lock()
+# One condition per room, all sharing the global lock. Waiters sleep until
+# their own room changes, so idle rooms cost no CPU and no requests.
+room_conditions = {}
+# room_name -> {user_id: timestamp of the user's last request}
+last_seen = {}
+# room_name -> timestamp of the last state change
+room_changed_at = {}
+
+def _serialize_room(room):
+    serializable_data = room.copy()
+    serializable_data["users"] = list(room["users"])
+    return serializable_data
+
+def _room_changed(room_name):
+    """Bumps the room version and wakes any long-poll waiting on it. Call with lock held."""
+    rooms[room_name]["version"] += 1
+    room_changed_at[room_name] = time.time()
+    room_conditions[room_name].notify_all()
+
+def _touch(room_name, user_id=None):
+    """Marks the room as recently used and refreshes the user's last_seen. Call with lock held."""
+    rooms.move_to_end(room_name)
+    if user_id is not None and user_id in rooms[room_name]["users"]:
+        last_seen[room_name][user_id] = time.time()
+
+def _delete_room(room_name):
+    """Removes a room and wakes its waiters, who will then answer 404. Call with lock held."""
+    rooms.pop(room_name, None)
+    last_seen.pop(room_name, None)
+    room_changed_at.pop(room_name, None)
+    condition = room_conditions.pop(room_name, None)
+    if condition is not None:
+        condition.notify_all()
+
+def _remove_user(room_name, user_id):
+    """Removes a user; deletes the room once it is empty. Call with lock held."""
+    room = rooms[room_name]
+    room["users"].discard(user_id)
+    room["timers_started"].pop(user_id, None)
+    last_seen[room_name].pop(user_id, None)
+    if room["users"]:
+        _room_changed(room_name)
+    else:
+        _delete_room(room_name)
+
+def _room_expired(room_name, now):
+    room = rooms[room_name]
+    if room["status"] == "cancelled":
+        return now - room_changed_at[room_name] > FINISHED_ROOM_TTL
+    if room["status"] == "running" and room["started_at"] is not None:
+        ends_at = room["started_at"] + (room["duration_seconds"] or 0)
+        return now - ends_at > FINISHED_ROOM_TTL
+    return False
+
+def sweep_rooms():
+    """Drops idle users and expired rooms. Returns the number of rooms deleted."""
+    now = time.time()
+    deleted = 0
+    with lock:
+        for room_name in list(rooms):
+            for user_id, seen_at in list(last_seen[room_name].items()):
+                if now - seen_at > USER_TTL:
+                    _remove_user(room_name, user_id)
+                    if room_name not in rooms:
+                        break
+            if room_name in rooms and _room_expired(room_name, now):
+                _delete_room(room_name)
+            if room_name not in rooms:
+                deleted += 1
+    return deleted
+
+def _sweeper_loop():
+    while True:
+        time.sleep(SWEEP_INTERVAL)
+        deleted = sweep_rooms()
+        if deleted:
+            print(f"[SWEEPER] {deleted} rooms expired, {len(rooms)} active.")
 
 @app.route('/join_room', methods=['POST'])
 def join_room():
@@ -18,26 +103,42 @@ def join_room():
 
     with lock:
         if room_name not in rooms:
+            if len(rooms) >= MAX_ROOMS:
+                _delete_room(next(iter(rooms))) # Least recently used
             rooms[room_name] = {
                 "users": set(),
                 "status": "waiting",
                 "timers_started": {},
                 "cancelled_by": None,
                 "duration_seconds": None, # ADDED: To store the session duration
-                "started_at": None       # ADDED: To store the universal start time
+                "started_at": None,      # ADDED: To store the universal start time
+                "version": 0             # Incremented on every state change
             }
-        
+            room_conditions[room_name] = Condition(lock)
+            last_seen[room_name] = {}
+
         room = rooms[room_name]
         if len(room["users"]) < MAX_CONNECTIONS or user_id in room["users"]:
             room["users"].add(user_id)
             room["timers_started"][user_id] = False
+            _touch(room_name, user_id)
+            _room_changed(room_name)
         else:
             return jsonify({"error": "Room is full"}), 409
 
-    response_data = rooms[room_name].copy()
-    response_data["users"] = list(rooms[room_name]["users"])
+        response_data = _serialize_room(room)
     return jsonify(response_data)
 
+@app.route('/leave_room', methods=['POST'])
+def leave_room():
+    data = request.json
+    room_name = data.get('room_name')
+    user_id = data.get('user_id')
+    with lock:
+        if room_name in rooms and user_id in rooms[room_name]["users"]:
+            _remove_user(room_name, user_id)
+    return jsonify({"message": "Left room"}), 200
+
 @app.route('/start_timer', methods=['POST'])
 def start_timer():
     data = request.json
@@ -49,17 +150,19 @@ def start_timer():
         if room_name in rooms and user_id in rooms[room_name]["users"]:
             room = rooms[room_name]
             room["timers_started"][user_id] = True
-            
+
             # The first user to start sets the duration for the room
             if room["duration_seconds"] is None:
                 room["duration_seconds"] = duration_seconds
-            
+
             # If all users have now started, officially begin the session
             if len(room["users"]) == MAX_CONNECTIONS and all(room["timers_started"].values()):
                 room["status"] = "running"
                 room["started_at"] = time.time() # Record universal start time
-    
-    response_data = rooms.get(room_name, {}).copy()
+            _touch(room_name, user_id)
+            _room_changed(room_name)
+
+        response_data = rooms.get(room_name, {}).copy()
     response_data["users"] = list(response_data.get("users", set()))
     return jsonify(response_data), 200
 
@@ -73,18 +176,38 @@ def cancel_timer():
         if room_name in rooms:
             rooms[room_name]["status"] = "cancelled"
             rooms[room_name]["cancelled_by"] = user_id
+            _touch(room_name, user_id)
+            _room_changed(room_name)
     return jsonify({"message": "Session cancelled"}), 200
 
 @app.route('/room_status', methods=['GET'])
 def room_status():
+    """
+    Returns the room state. With ?since=<version>, long-polls: the request
+    is held until the room version differs from `since` or LONG_POLL_TIMEOUT
+    expires, so clients see `running`/`cancelled` transitions immediately.
+    Passing ?user_id= keeps that user from being expired while it waits.
+    """
     room_name = request.args.get('room_name')
+    user_id = request.args.get('user_id')
+    since = request.args.get('since', type=int)
     with lock:
         room_data = rooms.get(room_name)
         if room_data:
-            serializable_data = room_data.copy()
-            serializable_data["users"] = list(room_data["users"])
-            return jsonify(serializable_data)
+            _touch(room_name, user_id)
+        if room_data and since is not None:
+            room_conditions[room_name].wait_for(
+                lambda: rooms.get(room_name) is not room_data or room_data["version"] != since,
+                timeout=LONG_POLL_TIMEOUT
+            )
+            room_data = rooms.get(room_name)
+            if room_data:
+                _touch(room_name, user_id)
+        if room_data:
+            return jsonify(_serialize_room(room_data))
     return jsonify({"error": "Room not found"}), 404
 
+Thread(target=_sweeper_loop, daemon=True).start()
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000)
+    app.run(host='0.0.0.0', port=5000, threaded=True)
@@ -0,0 +1,326 @@
+# sync_api_async.py
+"""
+Asyncio implementation of the sync server (same endpoints and JSON shapes as
+sync_api.py), using only the standard library.
+
+Every room owns its own lock/condition, so requests for unrelated rooms never
+contend, and a single event loop holds thousands of rooms and idle long-polls
+on one core. Run with:  python sync_api_async.py [--host H] [--port P]
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+
+MAX_CONNECTIONS = 2
+LONG_POLL_TIMEOUT = 25 # Max seconds a /room_status?since= request waits for a change
+MAX_ROOMS = 10000          # Beyond this, the least recently used room is evicted
+USER_TTL = 90              # A user with no request for this long is dropped (> LONG_POLL_TIMEOUT)
+FINISHED_ROOM_TTL = 60     # Cancelled/finished rooms linger this long so partners see the final state
+SWEEP_INTERVAL = 15        # Seconds between background sweeps
+MAX_HEADER_BYTES = 16 * 1024
+IDLE_TIMEOUT = 30          # Seconds a keep-alive connection may wait for (and send) the next request head
+BODY_TIMEOUT = 10          # Seconds to receive a request body once its headers arrived
+MAX_BODY_BYTES = 64 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large"}
+
+
+class Room:
+    def __init__(self):
+        self.users = set()
+        self.status = "waiting"
+        self.timers_started = {}
+        self.cancelled_by = None
+        self.duration_seconds = None
+        self.started_at = None
+        self.version = 0
+        self.changed_at = time.time()
+        self.last_seen = {} # user_id -> timestamp of the user's last request
+        self.deleted = False
+        # Per-room lock: long-polls wait on this room's condition only
+        self.lock = asyncio.Lock()
+        self.changed = asyncio.Condition(self.lock)
+
+    def to_dict(self):
+        return {
+            "users": list(self.users),
+            "status": self.status,
+            "timers_started": dict(self.timers_started),
+            "cancelled_by": self.cancelled_by,
+            "duration_seconds": self.duration_seconds,
+            "started_at": self.started_at,
+            "version": self.version,
+        }
+
+    async def bump(self):
+        async with self.lock:
+            self.version += 1
+            self.changed_at = time.time()
+            self.changed.notify_all()
+
+    def expired(self, now):
+        if self.status == "cancelled":
+            return now - self.changed_at > FINISHED_ROOM_TTL
+        if self.status == "running" and self.started_at is not None:
+            return now - (self.started_at + (self.duration_seconds or 0)) > FINISHED_ROOM_TTL
+        return False
+
+
+rooms = OrderedDict() # Ordered by last access, for LRU eviction
+
+
+def touch(room_name, user_id=None):
+    """Marks the room as recently used and refreshes the user's last_seen."""
+    room = rooms[room_name]
+    rooms.move_to_end(room_name)
+    if user_id is not None and user_id in room.users:
+        room.last_seen[user_id] = time.time()
+
+
+async def delete_room(room_name):
+    """Removes a room and wakes its waiters, who will then answer 404."""
+    room = rooms.pop(room_name, None)
+    if room is not None:
+        room.deleted = True
+        await room.bump()
+
+
+async def remove_user(room_name, user_id):
+    """Removes a user; deletes the room once it is empty."""
+    room = rooms[room_name]
+    room.users.discard(user_id)
+    room.timers_started.pop(user_id, None)
+    room.last_seen.pop(user_id, None)
+    if room.users:
+        await room.bump()
+    else:
+        await delete_room(room_name)
+
+
+async def sweep_rooms():
+    """Drops idle users and expired rooms. Returns the number of rooms deleted."""
+    now = time.time()
+    deleted = 0
+    for room_name in list(rooms):
+        room = rooms.get(room_name)
+        if room is None:
+            continue
+        for user_id, seen_at in list(room.last_seen.items()):
+            if now - seen_at > USER_TTL:
+                await remove_user(room_name, user_id)
+        if room_name in rooms and room.expired(now):
+            await delete_room(room_name)
+        if room_name not in rooms:
+            deleted += 1
+    return deleted
+
+
+async def sweeper_loop():
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        deleted = await sweep_rooms()
+        if deleted:
+            print(f"[SWEEPER] {deleted} rooms expired, {len(rooms)} active.")
+
+
+async def join_room(query, data):
+    room_name = data.get('room_name')
+    user_id = data.get('user_id')
+
+    room = rooms.get(room_name)
+    if room is None:
+        if len(rooms) >= MAX_ROOMS:
+            await delete_room(next(iter(rooms))) # Least recently used
+        room = rooms[room_name] = Room()
+
+    if len(room.users) < MAX_CONNECTIONS or user_id in room.users:
+        room.users.add(user_id)
+        room.timers_started[user_id] = False
+        touch(room_name, user_id)
+        await room.bump()
+    else:
+        return 409, {"error": "Room is full"}
+    return 200, room.to_dict()
+
+
+async def leave_room(query, data):
+    room_name = data.get('room_name')
+    user_id = data.get('user_id')
+    room = rooms.get(room_name)
+    if room is not None and user_id in room.users:
+        await remove_user(room_name, user_id)
+    return 200, {"message": "Left room"}
+
+
+async def start_timer(query, data):
+    room_name = data.get('room_name')
+    user_id = data.get('user_id')
+    duration_seconds = data.get('duration_seconds')
+
+    room = rooms.get(room_name)
+    if room is None:
+        return 200, {"users": []}
+    if user_id in room.users:
+        room.timers_started[user_id] = True
+
+        # The first user to start sets the duration for the room
+        if room.duration_seconds is None:
+            room.duration_seconds = duration_seconds
+
+        # If all users have now started, officially begin the session
+        if len(room.users) == MAX_CONNECTIONS and all(room.timers_started.values()):
+            room.status = "running"
+            room.started_at = time.time() # Record universal start time
+        touch(room_name, user_id)
+        await room.bump()
+    return 200, room.to_dict()
+
+
+async def cancel_timer(query, data):
+    room_name = data.get('room_name')
+    user_id = data.get('user_id')
+    room = rooms.get(room_name)
+    if room is not None:
+        room.status = "cancelled"
+        room.cancelled_by = user_id
+        touch(room_name, user_id)
+        await room.bump()
+    return 200, {"message": "Session cancelled"}
+
+
+async def room_status(query, data):
+    room_name = query.get('room_name')
+    user_id = query.get('user_id')
+    room = rooms.get(room_name)
+    if room is None:
+        return 404, {"error": "Room not found"}
+    touch(room_name, user_id)
+
+    since = query.get('since')
+    if since is not None and since.lstrip('-').isdigit():
+        since = int(since)
+        async with room.lock:
+            try:
+                await asyncio.wait_for(
+                    room.changed.wait_for(lambda: room.version != since),
+                    timeout=LONG_POLL_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                pass
+        if room.deleted:
+            return 404, {"error": "Room not found"}
+        touch(room_name, user_id)
+    return 200, room.to_dict()
+
+
+ROUTES = {
+    '/join_room': ('POST', join_room),
+    '/leave_room': ('POST', leave_room),
+    '/start_timer': ('POST', start_timer),
+    '/cancel_timer': ('POST', cancel_timer),
+    '/room_status': ('GET', room_status),
+}
+
+
+async def dispatch(method, target, body):
+    url = urlsplit(target)
+    route = ROUTES.get(url.path)
+    if route is None:
+        return 404, {"error": "Not found"}
+    if method != route[0]:
+        return 405, {"error": "Method not allowed"}
+
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    data = {}
+    if body:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return 400, {"error": "Invalid JSON"}
+        if not isinstance(data, dict):
+            return 400, {"error": "Invalid JSON"}
+    return await route[1](query, data)
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode() + body)
+
+
+async def handle_connection(reader, writer):
+    """Minimal HTTP/1.1 loop with keep-alive; enough for the JSON endpoints above."""
+    try:
+        while True:
+            try:
+                raw_head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=IDLE_TIMEOUT)
+            except asyncio.LimitOverrunError:
+                _write_response(writer, 413, {"error": "Headers too large"}, False)
+                break
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                break # Closed, or idle/too slow: drop it instead of holding the task forever
+
+            lines = raw_head.decode('latin-1').split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                _write_response(writer, 400, {"error": "Bad request line"}, False)
+                break
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            try:
+                length = int(headers.get('content-length', 0) or 0)
+            except ValueError:
+                _write_response(writer, 400, {"error": "Bad Content-Length"}, False)
+                break
+            if length > MAX_BODY_BYTES:
+                _write_response(writer, 413, {"error": "Body too large"}, False)
+                break
+            try:
+                body = await asyncio.wait_for(reader.readexactly(length), timeout=BODY_TIMEOUT) if length else b""
+            except asyncio.TimeoutError:
+                break
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' and (version == "HTTP/1.1" or connection == 'keep-alive')
+
+            status, payload = await dispatch(method, target, body)
+            _write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host='0.0.0.0', port=5000):
+    server = await asyncio.start_server(handle_connection, host, port, limit=MAX_HEADER_BYTES, backlog=4096)
+    sweeper = asyncio.create_task(sweeper_loop())
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Asyncio sync server")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
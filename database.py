@@ -0,0 +1,45 @@
+# database.py
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+POOL_SIZE = 16        # Conexões por pool: uma por thread do gunicorn (THREADS)
+MAX_OVERFLOW = 4
+POOL_TIMEOUT = 10     # Segundos esperando uma conexão livre antes de erro
+BUSY_TIMEOUT_MS = 5000
+
+def is_sqlite(uri):
+    return make_url(uri).get_backend_name() == "sqlite"
+
+def engine_options(uri, pool_size=POOL_SIZE):
+    """Opções de create_engine para `uri`: pool dimensionado (exceto SQLite em memória, que não usa pool)."""
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    options = {'pool_size': pool_size, 'max_overflow': MAX_OVERFLOW, 'pool_timeout': POOL_TIMEOUT}
+    if url.get_backend_name() != "sqlite":
+        options['pool_pre_ping'] = True # Conexões de rede podem cair enquanto ociosas no pool
+    return options
+
+def tune_sqlite(engine, busy_timeout_ms=BUSY_TIMEOUT_MS, read_only=False):
+    """
+    Ajusta cada conexão SQLite do engine ao ser aberta:
+
+    * journal_mode=WAL: leitores não bloqueiam o escritor nem são bloqueados por ele;
+    * synchronous=NORMAL: com WAL, um crash perde no máximo a última transação, sem corromper;
+    * busy_timeout: quem encontra o banco travado espera em vez de falhar na hora;
+    * conexões de leitura ficam em query_only.
+
+    A transação de escrita continua começando só no primeiro INSERT/UPDATE (padrão do
+    módulo sqlite3), então a trava de escrita fica presa só durante as escritas. Com
+    BEGIN IMMEDIATE ela cobriria a requisição inteira, e o db_benchmark.py mostrou
+    menos escritas por segundo e uma cauda de latência maior.
+    """
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
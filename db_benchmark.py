@@ -0,0 +1,105 @@
+# db_benchmark.py
+"""
+Leituras e escritas concorrentes no banco do servidor (server.py): processos
+escritores enviam sessões para /add_time/batch enquanto processos leitores
+consultam /stats/<usuário>, pelo cliente de teste do Flask, sem rede.
+
+    python db_benchmark.py                          # SQLite ajustado x padrão
+    python db_benchmark.py --writers 8 --readers 16 --seconds 10
+    python db_benchmark.py --url postgresql://...   # um banco já existente (só o modo ajustado)
+
+"Ajustado" é a configuração do servidor (WAL, synchronous=NORMAL, busy_timeout
+e pool de leitura só-leitura); "padrão" desliga o SQLITE_TUNING.
+Cada leitor/escritor é um processo com seu próprio app, como os processos do
+gunicorn, para que a disputa medida seja a do banco e não a do GIL.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+USERS = 200
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000
+
+def _seed(server, app, users):
+    """Cria os usuários direto no banco (sem o hash de senha) e devolve {nome: token}."""
+    with app.app_context():
+        existing = {name for name, in server.read_all(server.db.select(server.User.username))}
+        server.db.session.add_all(
+            server.User(username=f"bench{i}", password_hash="-")
+            for i in range(users) if f"bench{i}" not in existing
+        )
+        server.db.session.commit()
+        rows = server.read_all(server.db.select(server.User.id, server.User.username)
+                               .where(server.User.username.like("bench%")))
+    return {username: server.tokens.issue(user_id, username) for user_id, username in rows}
+
+def _worker(kind, config, tokens, seconds):
+    """Roda num processo próprio, com a própria instância do app, como um processo do gunicorn."""
+    import server
+    app = server.create_app(config)
+    client = app.test_client()
+    usernames = list(tokens)
+    today = date.today()
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        username = random.choice(usernames)
+        started = time.perf_counter()
+        if kind == 'write':
+            session = {'session_id': uuid.uuid4().hex, 'seconds': 60,
+                       'day': (today - timedelta(days=random.randrange(30))).isoformat()}
+            response = client.post("/add_time/batch", json={'sessions': [session]},
+                                   headers={'Authorization': f"Bearer {tokens[username]}"})
+        else:
+            response = client.get(f"/stats/{username}")
+        latencies.append(time.perf_counter() - started)
+        errors += response.status_code != 200
+    return kind, latencies, errors
+
+def run(label, config, writers, readers, seconds):
+    import server # Importado aqui para que os erros de dependência apareçam só ao rodar
+    config = dict(config, LOG_LEVEL="WARNING", SECRET_KEY="benchmark")
+    app = server.create_app(config)
+    tokens = _seed(server, app, USERS)
+    with app.app_context():
+        for engine in server.db.engines.values():
+            engine.dispose() # Nenhuma conexão aberta deve ser herdada pelos processos filhos
+
+    jobs = [('write', config, tokens, seconds)] * writers + [('read', config, tokens, seconds)] * readers
+    results = {'write': ([], 0), 'read': ([], 0)} # tipo -> (latências, erros)
+    with multiprocessing.Pool(len(jobs)) as pool:
+        for kind, latencies, errors in pool.starmap(_worker, jobs):
+            results[kind] = (results[kind][0] + latencies, results[kind][1] + errors)
+
+    print(f"\n{label}")
+    for kind, (latencies, errors) in results.items():
+        print(f"  {kind:5}: {len(latencies) / seconds:8.0f} ops/s  "
+              f"p50 {_percentile(latencies, 0.50):7.1f} ms  p95 {_percentile(latencies, 0.95):7.1f} ms  "
+              f"p99 {_percentile(latencies, 0.99):7.1f} ms  erros {errors}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--url", help="URL de um banco já existente (os dados de teste ficam nele)")
+    args = parser.parse_args()
+
+    if args.url:
+        run(args.url, {'SQLALCHEMY_DATABASE_URI': args.url}, args.writers, args.readers, args.seconds)
+    else:
+        for label, tuned in (("SQLite ajustado", True), ("SQLite padrão", False)):
+            with tempfile.TemporaryDirectory() as directory:
+                uri = "sqlite:///" + os.path.join(directory, "benchmark.db")
+                run(label, {'SQLALCHEMY_DATABASE_URI': uri, 'SQLITE_TUNING': tuned},
+                    args.writers, args.readers, args.seconds)
@@ -0,0 +1,291 @@
+# dns_blocker.py
+"""
+Resolvedor DNS local (stub) para bloquear sites sem reescrever o arquivo hosts.
+
+Responde nomes bloqueados (o domínio e qualquer subdomínio, via DomainTrie; tanto
+"site.com" quanto "*.site.com" bloqueiam site.com e tudo abaixo dele) com
+REDIRECT_IP e repassa o resto ao resolvedor upstream, guardando as respostas em
+cache pelo menor TTL. A lista de bloqueio é trocada por uma porta de controle
+local: o app envia uma linha JSON e o resolvedor troca a referência da trie,
+sem tocar em arquivos nem limpar o cache DNS do sistema.
+
+    python dns_blocker.py --listen 127.0.0.1:53 --upstream 1.1.1.1:53 --control 127.0.0.1:5354
+
+Para ter efeito, o DNS do sistema precisa apontar para o endereço de --listen.
+"""
+import argparse
+import json
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from domain_trie import DomainTrie
+
+TYPE_A = 1
+TYPE_AAAA = 28
+CLASS_IN = 1
+RCODE_NOERROR = 0
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+
+BLOCK_TTL = 60             # TTL das respostas para nomes bloqueados
+DEFAULT_CACHE_TTL = 60     # Quando a resposta upstream não traz nenhum registro
+MAX_CACHE_TTL = 3600
+MAX_CACHE_ENTRIES = 10000
+UPSTREAM_TIMEOUT = 2
+
+# --- Mensagens DNS (RFC 1035), só o necessário para um stub ---
+
+def _read_name(packet, offset):
+    """Lê um nome (com ponteiros de compressão). Retorna (nome, offset após o nome)."""
+    labels = []
+    end_offset = None
+    jumps = 0
+    while True:
+        length = packet[offset]
+        if length & 0xC0 == 0xC0:
+            if end_offset is None:
+                end_offset = offset + 2
+            offset = ((length & 0x3F) << 8) | packet[offset + 1]
+            jumps += 1
+            if jumps > 64:
+                raise ValueError("Loop de compressão no nome DNS")
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(packet[offset:offset + length].decode('ascii', 'replace'))
+        offset += length
+    return '.'.join(labels), (end_offset if end_offset is not None else offset)
+
+def parse_question(packet):
+    """Retorna (id, flags, nome, tipo, classe, offset do fim da pergunta) da primeira pergunta."""
+    txid, flags, qdcount = struct.unpack('!HHH', packet[:6])
+    if qdcount < 1:
+        raise ValueError("Consulta sem pergunta")
+    name, offset = _read_name(packet, 12)
+    qtype, qclass = struct.unpack('!HH', packet[offset:offset + 4])
+    return txid, flags, name, qtype, qclass, offset + 4
+
+def response_rcode(packet):
+    return struct.unpack('!H', packet[2:4])[0] & 0x000F
+
+def min_ttl(packet):
+    """Menor TTL entre as seções de resposta e autoridade, ou None se não houver registros."""
+    qdcount, ancount, nscount = struct.unpack('!HHH', packet[4:10])
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = _read_name(packet, offset)
+        offset += 4
+    ttls = []
+    for _ in range(ancount + nscount):
+        _, offset = _read_name(packet, offset)
+        _, _, ttl, rdlength = struct.unpack('!HHIH', packet[offset:offset + 10])
+        ttls.append(ttl)
+        offset += 10 + rdlength
+    return min(ttls) if ttls else None
+
+def build_response(query, question_end, rcode=RCODE_NOERROR, answer=None):
+    """Monta a resposta reaproveitando o cabeçalho e a pergunta da consulta."""
+    txid, flags = struct.unpack('!HH', query[:4])
+    flags = 0x8000 | (flags & 0x7900) | 0x0080 | rcode # QR, opcode+RD da consulta, RA
+    header = struct.pack('!HHHHHH', txid, flags, 1, 1 if answer else 0, 0, 0)
+    return header + query[12:question_end] + (answer or b'')
+
+def build_blocked_response(query, question_end, qtype, redirect_ip, redirect_ip6):
+    if qtype == TYPE_A:
+        rdata = socket.inet_pton(socket.AF_INET, redirect_ip)
+    elif qtype == TYPE_AAAA:
+        rdata = socket.inet_pton(socket.AF_INET6, redirect_ip6)
+    else:
+        return build_response(query, question_end) # Sem registros do tipo pedido
+    # 0xC00C: ponteiro para o nome da pergunta, logo após o cabeçalho
+    answer = struct.pack('!HHHIH', 0xC00C, qtype, CLASS_IN, BLOCK_TTL, len(rdata)) + rdata
+    return build_response(query, question_end, answer=answer)
+
+
+class ResponseCache:
+    """Cache LRU de respostas upstream, válido pelo menor TTL de cada resposta."""
+    def __init__(self, max_entries=MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, response, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class BlockingResolver:
+    def __init__(self, upstream, redirect_ip="127.0.0.1", redirect_ip6="::1"):
+        self.upstream = upstream
+        self.redirect_ip = redirect_ip
+        self.redirect_ip6 = redirect_ip6
+        self.cache = ResponseCache()
+        # None = bloqueio desligado. Trocado inteiro em set_blocklist, nunca alterado no lugar,
+        # então as threads de consulta sempre veem uma trie completa sem precisar de lock.
+        self.blocklist = None
+        self._trie = None    # Última trie montada, guardada mesmo com o bloqueio desligado
+        self._domains = None # Lista que gerou self._trie
+
+    def set_blocklist(self, domains, enabled):
+        """
+        Liga/desliga o bloqueio e, se `domains` não for None, troca a lista. A trie só é
+        remontada quando a lista muda: ligar e desligar só troca a referência ativa.
+        """
+        if domains is not None:
+            domains = tuple(domains)
+            if domains != self._domains:
+                self._trie = DomainTrie(domains, include_subdomains=True)
+                self._domains = domains
+        self.blocklist = self._trie if enabled and self._trie is not None else None
+
+    def resolve(self, query):
+        try:
+            _, _, name, qtype, qclass, question_end = parse_question(query)
+        except (ValueError, IndexError, struct.error):
+            return None
+
+        blocklist = self.blocklist
+        if blocklist is not None and blocklist.matches(name):
+            return build_blocked_response(query, question_end, qtype, self.redirect_ip, self.redirect_ip6)
+
+        key = (name.lower(), qtype, qclass)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return query[:2] + cached[2:] # Reaproveita a resposta com o ID desta consulta
+
+        try:
+            response = self._forward(query)
+        except OSError:
+            return build_response(query, question_end, rcode=RCODE_SERVFAIL)
+
+        truncated = struct.unpack('!H', response[2:4])[0] & 0x0200
+        if not truncated and response_rcode(response) in (RCODE_NOERROR, RCODE_NXDOMAIN):
+            try:
+                ttl = min_ttl(response)
+            except (ValueError, IndexError, struct.error):
+                ttl = None
+            ttl = DEFAULT_CACHE_TTL if ttl is None else min(ttl, MAX_CACHE_TTL)
+            if ttl > 0:
+                self.cache.put(key, response, ttl)
+        return response
+
+    def _forward(self, query):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(UPSTREAM_TIMEOUT)
+            sock.sendto(query, self.upstream)
+            while True:
+                response, _ = sock.recvfrom(4096)
+                if response[:2] == query[:2]:
+                    return response
+
+
+class _DnsHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        query, sock = self.request
+        response = self.server.resolver.resolve(query)
+        if response is not None:
+            sock.sendto(response, self.client_address)
+
+class DnsServer(socketserver.ThreadingUDPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, resolver):
+        super().__init__(address, _DnsHandler)
+        self.resolver = resolver
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    """Uma linha JSON por conexão: {"enabled": bool, "domains": [...]}; sem "domains", mantém a lista."""
+    def handle(self):
+        try:
+            command = json.loads(self.rfile.readline())
+            self.server.resolver.set_blocklist(command.get('domains'), bool(command.get('enabled')))
+            self.wfile.write(b"OK\n")
+        except (ValueError, AttributeError) as e:
+            self.wfile.write(f"ERROR {e}\n".encode())
+
+class ControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, resolver):
+        super().__init__(address, _ControlHandler)
+        self.resolver = resolver
+
+
+def send_blocklist(control_address, domains, enabled, timeout=1, attempts=5):
+    """
+    Envia a lista ao resolvedor (usado pelo app). Tenta algumas vezes enquanto ele inicia.
+    Com domains=None só liga/desliga o bloqueio, sem mandar (nem remontar) a lista.
+    """
+    command = {'enabled': enabled}
+    if domains is not None:
+        command['domains'] = list(domains)
+    message = json.dumps(command).encode() + b"\n"
+    for attempt in range(attempts):
+        try:
+            with socket.create_connection(control_address, timeout=timeout) as sock:
+                sock.sendall(message)
+                reply = sock.makefile('rb').readline().strip()
+            if reply != b"OK":
+                raise RuntimeError(f"Resolvedor recusou a lista: {reply.decode(errors='replace')}")
+            return
+        except ConnectionRefusedError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.2 * (attempt + 1))
+
+def parse_address(value, default_port):
+    host, _, port = value.rpartition(':')
+    if not host:
+        return value, default_port
+    return host, int(port)
+
+def serve(listen, upstream, control):
+    """Sobe os servidores DNS e de controle em threads. Retorna (dns_server, control_server)."""
+    resolver = BlockingResolver(upstream)
+    dns_server = DnsServer(listen, resolver)
+    control_server = ControlServer(control, resolver)
+    threading.Thread(target=dns_server.serve_forever, daemon=True).start()
+    threading.Thread(target=control_server.serve_forever, daemon=True).start()
+    return dns_server, control_server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Resolvedor DNS local com bloqueio de domínios")
+    parser.add_argument('--listen', default="127.0.0.1:53")
+    parser.add_argument('--upstream', default="1.1.1.1:53")
+    parser.add_argument('--control', default="127.0.0.1:5354")
+    args = parser.parse_args()
+
+    dns_server, control_server = serve(
+        parse_address(args.listen, 53), parse_address(args.upstream, 53), parse_address(args.control, 5354)
+    )
+    print(f">>> Resolvedor escutando em {args.listen}, upstream {args.upstream}, controle em {args.control}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        dns_server.shutdown()
+        control_server.shutdown()
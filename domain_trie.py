@@ -0,0 +1,210 @@
+# domain_trie.py
+import re
+from urllib.parse import urlparse
+
+# Marcadores guardados nos nós da trie (não colidem com rótulos de domínio)
+_EXACT = "$exact"
+_SUBDOMAINS = "$sub"
+
+WILDCARD_PREFIX = "*."
+_LABEL = r"[a-z0-9_](?:[a-z0-9_-]{0,61}[a-z0-9_])?"
+_HOSTNAME_RE = re.compile(rf"(?:{_LABEL}\.)+{_LABEL}")
+# Endereços usados por listas no formato hosts ("0.0.0.0 anuncio.com")
+_HOSTS_ADDRESSES = {"0.0.0.0", "127.0.0.1", "::", "::1", "::0"}
+_IGNORED_HOSTS = {"localhost", "localhost.localdomain", "local", "broadcasthost", "0.0.0.0"}
+# "#" só abre comentário no início da linha ou depois de espaço; colado ao texto faz parte de uma regra
+_COMMENT_RE = re.compile(r"(?:^|\s)#.*")
+# Regras cosméticas/de exceção do Adblock ("site.com##.anuncio", "site.com#@#.x", "#?#", "#$#"):
+# escondem elementos da página e não dizem nada sobre bloquear o domínio
+_COSMETIC_RE = re.compile(r"#@?[?$]?#")
+
+def normalize_domain(text):
+    """
+    Normaliza uma entrada digitada ou importada: "https://WWW.Site.com:8080/x" -> "www.site.com",
+    "*.site.com" continua curinga. Retorna None se não for um domínio válido.
+    """
+    text = text.strip().lower()
+    wildcard = text.startswith(WILDCARD_PREFIX)
+    if wildcard:
+        text = text[len(WILDCARD_PREFIX):]
+    # Caminho rápido para o caso comum (domínio puro); urlparse só quando parece uma URL
+    if '/' in text or ':' in text or '@' in text:
+        host = urlparse(text if '://' in text else '//' + text).hostname or ''
+    else:
+        host = text
+    host = host.strip('.')
+    if not host.isascii():
+        try:
+            host = host.encode('idna').decode('ascii')
+        except UnicodeError:
+            return None
+    if len(host) > 253 or not _HOSTNAME_RE.fullmatch(host):
+        return None
+    return WILDCARD_PREFIX + host if wildcard else host
+
+
+class DomainTrie:
+    """
+    Trie de rótulos invertidos: "m.youtube.com" é guardado como com -> youtube -> m.
+    A busca custa O(número de rótulos), independente do tamanho da lista.
+
+    Cada nó pode ter duas marcas: _EXACT (o próprio domínio) e _SUBDOMAINS
+    (qualquer nome abaixo dele, vinda de uma entrada "*.dominio"). Entradas são
+    strings já normalizadas, como "site.com" ou "*.site.com".
+    """
+    def __init__(self, entries=(), include_subdomains=False):
+        self._root = {}
+        self._size = 0
+        self._entries = None # Cache de entries(), descartado a cada alteração
+        for entry in entries:
+            self.add_entry(entry, include_subdomains=include_subdomains)
+
+    @staticmethod
+    def _labels(domain):
+        return domain.strip().strip('.').lower().split('.')[::-1]
+
+    @staticmethod
+    def _split_entry(entry):
+        if entry.startswith(WILDCARD_PREFIX):
+            return entry[len(WILDCARD_PREFIX):], _SUBDOMAINS
+        return entry, _EXACT
+
+    def _node(self, domain, create=False):
+        node = self._root
+        for label in self._labels(domain):
+            child = node.get(label)
+            if child is None:
+                if not create:
+                    return None
+                child = node[label] = {}
+            node = child
+        return node
+
+    def _mark(self, domain, flag):
+        node = self._node(domain, create=True)
+        if node.get(flag):
+            return False
+        node[flag] = True
+        self._size += 1
+        self._entries = None
+        return True
+
+    def add(self, domain, include_subdomains=True, exact=True):
+        """Bloqueia `domain` (se `exact`) e, se `include_subdomains`, tudo abaixo dele."""
+        if exact:
+            self._mark(domain, _EXACT)
+        if include_subdomains:
+            self._mark(domain, _SUBDOMAINS)
+
+    def add_entry(self, entry, include_subdomains=False):
+        """
+        Adiciona uma entrada normalizada. Retorna False se ela já existia.
+        Com `include_subdomains`, "site.com" e "*.site.com" cobrem igualmente o
+        domínio e seus subdomínios, como o HostsManager (que também bloqueia
+        site.com para "*.site.com").
+        """
+        domain, flag = self._split_entry(entry)
+        added = self._mark(domain, flag)
+        if include_subdomains:
+            other = _EXACT if flag == _SUBDOMAINS else _SUBDOMAINS
+            added = self._mark(domain, other) or added
+        return added
+
+    def has_entry(self, entry):
+        domain, flag = self._split_entry(entry)
+        node = self._node(domain)
+        return bool(node and node.get(flag))
+
+    def discard_entry(self, entry):
+        """Remove uma entrada (os nós vazios ficam; são poucos e reaproveitados)."""
+        domain, flag = self._split_entry(entry)
+        node = self._node(domain)
+        if node and node.pop(flag, False):
+            self._size -= 1
+            self._entries = None
+            return True
+        return False
+
+    def matches(self, name):
+        """True se `name` é um domínio bloqueado ou subdomínio de um domínio bloqueado com curinga."""
+        node = self._root
+        labels = self._labels(name)
+        for i, label in enumerate(labels):
+            node = node.get(label)
+            if node is None:
+                return False
+            if i < len(labels) - 1 and node.get(_SUBDOMAINS):
+                return True
+        return bool(node.get(_EXACT))
+
+    def entries(self):
+        """
+        Tupla com as entradas ("site.com", "*.site.com") em ordem de rótulos invertidos.
+        Fica em cache até a próxima alteração, então aplicar a mesma lista de novo não percorre a trie.
+        """
+        if self._entries is None:
+            self._entries = tuple(self._walk())
+        return self._entries
+
+    def _walk(self):
+        stack = [(self._root, [])]
+        while stack:
+            node, labels = stack.pop()
+            if labels:
+                domain = '.'.join(reversed(labels))
+                if node.get(_EXACT):
+                    yield domain
+                if node.get(_SUBDOMAINS):
+                    yield WILDCARD_PREFIX + domain
+            for label in sorted((key for key in node if not key.startswith('$')), reverse=True):
+                stack.append((node[label], labels + [label]))
+
+    def __contains__(self, name):
+        return self.matches(name)
+
+    def __len__(self):
+        return self._size
+
+
+def iter_blocklist_file(path):
+    """
+    Lê uma lista de bloqueio linha a linha, sem carregar o arquivo inteiro, e gera
+    entradas normalizadas. Aceita domínios/URLs soltos, formato hosts
+    ("0.0.0.0 site.com") e regras simples de Adblock ("||site.com^" vira "*.site.com").
+    Regras cosméticas e de exceção do Adblock ("##", "#@#", "@@||...") são ignoradas.
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = _COMMENT_RE.sub('', line).strip()
+            if not line or line.startswith(('!', '[', '@@')) or _COSMETIC_RE.search(line):
+                continue
+            if line.startswith('||'):
+                rule = line[2:].split('^', 1)[0]
+                entry = normalize_domain(WILDCARD_PREFIX + rule) if '$' not in line and '/' not in rule else None
+                if entry:
+                    yield entry
+                    yield entry[len(WILDCARD_PREFIX):]
+                continue
+            fields = line.split()
+            if fields[0] in _HOSTS_ADDRESSES:
+                fields = fields[1:]
+            for field in fields:
+                if field in _IGNORED_HOSTS:
+                    continue
+                entry = normalize_domain(field)
+                if entry:
+                    yield entry
+
+def load_blocklist_file(path, existing=None):
+    """
+    Lê o arquivo e retorna a lista de entradas novas (sem repetidas e que ainda não
+    estejam em `existing`, qualquer coleção com `in`). Pensada para rodar fora da thread da interface.
+    """
+    seen = set()
+    new_entries = []
+    for entry in iter_blocklist_file(path):
+        if entry in seen or (existing is not None and entry in existing):
+            continue
+        seen.add(entry)
+        new_entries.append(entry)
+    return new_entries
@@ -4,17 +4,18 @@ import sys
 import requests
 import math
 import json
-from PyQt6.QtCore import QUrl, Qt, QPoint, QRectF, QSize, QTimer
+from PyQt6.QtCore import Qt, QPoint, QRectF, QSize, QTimer
 from PyQt6.QtGui import QColor, QFont, QIcon, QPainter, QPen, QPixmap, QIntValidator
 from PyQt6.QtWidgets import (
     QApplication, QCheckBox, QDialog, QFormLayout, QHBoxLayout,
     QLabel, QLineEdit, QStyle, QVBoxLayout, QWidget, QTabWidget,
-    QPushButton, QListWidget, QTableWidget, QGraphicsDropShadowEffect
+    QPushButton, QListView, QAbstractItemView, QComboBox, QTableWidget, QGraphicsDropShadowEffect
 )
 from PyQt6.QtSvg import QSvgRenderer
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineSettings
-from history_graph import HistoryGraph
+from history_graph import HistoryGraph, ZOOM_DAYS, ZOOM_WEEKS, ZOOM_MONTHS
+from block_list_model import BlockListModel
+from hourglass_view import create_hourglass_view
+from network import api_client
 
 SERVER_BASE_URL = "http://201.23.72.236:5000"
 
@@ -45,6 +46,15 @@ def recolor_svg_to_pixmap(svg_path: str, color: QColor, size: QSize) -> QPixmap:
         print(f"Error recoloring SVG {svg_path}: {e}")
         return QPixmap()
 
+def create_block_list_view(model) -> QListView:
+    """QListView para um BlockListModel: linhas de altura fixa, então só as visíveis são medidas e desenhadas."""
+    view = QListView()
+    view.setModel(model)
+    view.setUniformItemSizes(True)
+    view.setLayoutMode(QListView.LayoutMode.Batched)
+    view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+    return view
+
 class LoginDialog(QDialog):
     # This class is unchanged
     def __init__(self, parent=None):
@@ -53,6 +63,7 @@ class LoginDialog(QDialog):
         self.setModal(True)
         self.setMinimumWidth(400)
         self.successful_username = None
+        self.successful_token = None
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.old_pos = None
         self.title_bar = QWidget()
@@ -143,12 +154,18 @@ class LoginDialog(QDialog):
             self.login_button.setEnabled(False)
             self.error_label.setText("Conectando...")
             QApplication.processEvents()
-            response = requests.post(server_url, json=payload, timeout=10)
+            # Roda na thread da interface: sem novas tentativas, a espera fica limitada a um timeout
+            response = api_client.post(server_url, json=payload, retries=0)
             if response.status_code == 200:
-                self.successful_username = username
+                # O servidor devolve um token assinado; as chamadas seguintes se identificam por ele
+                data = response.json()
+                self.successful_username = data.get('username', username)
+                self.successful_token = data.get('token')
                 self.accept()
             elif response.status_code == 401:
                 self.error_label.setText("Usuário ou senha inválidos.")
+            elif response.status_code == 503:
+                self.error_label.setText("Servidor ocupado. Tente novamente em instantes.")
             else:
                 self.error_label.setText(f"Erro no servidor: {response.status_code}")
         except requests.exceptions.ConnectionError:
@@ -252,7 +269,8 @@ class RegisterDialog(QDialog):
             self.register_button.setEnabled(False)
             self.status_label.setText("Registrando...")
             QApplication.processEvents()
-            response = requests.post(server_url, json=payload, timeout=10)
+            # Sem novas tentativas: um reenvio após a criação responderia 409
+            response = api_client.post(server_url, json=payload, retries=0)
             if response.status_code == 201:
                 self.status_label.setStyleSheet("color: #55ff7f;")
                 self.status_label.setText("Usuário criado! Você já pode fazer o login.")
@@ -260,6 +278,9 @@ class RegisterDialog(QDialog):
             elif response.status_code == 409:
                 self.status_label.setStyleSheet("color: #ff5555;")
                 self.status_label.setText("Este nome de usuário já existe.")
+            elif response.status_code == 503:
+                self.status_label.setStyleSheet("color: #ff5555;")
+                self.status_label.setText("Servidor ocupado. Tente novamente em instantes.")
             else:
                 self.status_label.setStyleSheet("color: #ff5555;")
                 self.status_label.setText(f"Erro no servidor: {response.status_code}")
@@ -284,23 +305,15 @@ class CircularTimerWidget(QWidget):
         super().__init__(parent)
         self.total_seconds = 0
         self.current_seconds_float = 0.0
-        self.page_loaded = False # ADDED: Flag to track if the HTML is ready
+        self.animation_loaded = False # ADDED: Flag to track if the hourglass is ready
+        # Last values actually sent to the animation / painted, to skip redundant updates
+        self._last_text = None
+        self._last_arc_pixel = None
 
-        # --- Create and configure the WebEngine view ---
-        self.web_view = QWebEngineView(self)
-        self.web_view.settings().setAttribute(QWebEngineSettings.WebAttribute.ShowScrollBars, False)
-        self.web_view.page().setBackgroundColor(Qt.GlobalColor.transparent)
-
-        # --- Load the local HTML player file ---
-        if getattr(sys, 'frozen', False):
-            base_path = sys._MEIPASS
-        else:
-            base_path = os.path.dirname(os.path.abspath(__file__))
-        html_path = os.path.join(base_path, "lottie_player.html")
-        self.web_view.setUrl(QUrl.fromLocalFile(html_path))
-
-        self.web_view.loadFinished.connect(self._on_load_finished)
-        self.web_view.hide()
+        # --- Hourglass animation (native rlottie renderer or WebEngine fallback) ---
+        self.hourglass_view = create_hourglass_view(self)
+        self.hourglass_view.loaded.connect(self._on_animation_loaded)
+        self.hourglass_view.hide()
 
         # --- Input fields layout ---
         self.hour_input = QLineEdit("00")
@@ -340,50 +353,41 @@ class CircularTimerWidget(QWidget):
         main_layout.addStretch()
         self.input_widgets = [self.hour_input, self.minute_input, self.second_input, colon1, colon2]
 
-        # DEPOIS
-    # In gui.py, inside the CircularTimerWidget class
-    def _on_load_finished(self, success):
-        if not success:
-            print("Error: Could not load lottie_player.html")
-            return
-        
-        self.page_loaded = True
-        
-        try:
-            json_path_abs = os.path.abspath("data/hourglass.json")
-            with open(json_path_abs, 'r', encoding='utf-8') as f:
-                animation_data = json.load(f)
-                
-            json_string_for_js = json.dumps(animation_data)
-            
-            self.web_view.page().runJavaScript(f"loadAnimation(`{json_string_for_js}`);")
-
-        except Exception as e:
-            print(f"Error loading or passing animation data: {e}")
-
+    def _on_animation_loaded(self):
+        self.animation_loaded = True
         self.resizeEvent(None)
 
-    def resizeEvent(self, event):
-        super().resizeEvent(event)
-        
-        if not self.page_loaded: return
-
+    def _drawing_rect(self):
         rect = self.rect()
         side = min(rect.width(), rect.height())
         
         # ESTA É A LINHA QUE CONTROLA O TAMANHO
         margin = 15
         
-        drawing_rect = QRectF((rect.width() - side) / 2 + margin, (rect.height() - side) / 2 + margin, side - 2 * margin, side - 2 * margin)
+        return QRectF((rect.width() - side) / 2 + margin, (rect.height() - side) / 2 + margin, side - 2 * margin, side - 2 * margin)
+
+    def arc_length_pixels(self):
+        """Length in pixels of the full progress arc at the current size."""
+        return max(1.0, math.pi * self._drawing_rect().width())
+
+    def msecs_per_arc_pixel(self, total_seconds):
+        """How long the arc takes to advance one pixel for a session of `total_seconds`."""
+        return total_seconds * 1000 / self.arc_length_pixels()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._last_arc_pixel = None
         
-        self.web_view.setGeometry(drawing_rect.toRect())
-        self.web_view.page().runJavaScript("resizeAnimation();")
+        if not self.animation_loaded: return
+
+        self.hourglass_view.setGeometry(self._drawing_rect().toRect())
+        self.hourglass_view.refresh_size()
 
     def set_time(self, total_seconds, current_seconds_float):
         self.total_seconds = total_seconds
         self.current_seconds_float = current_seconds_float
 
-        if not self.page_loaded: return # ADDED: Guard clause
+        if not self.animation_loaded: return # ADDED: Guard clause
         
         if not self.hour_input.isVisible():
             current_seconds_int = int(math.ceil(self.current_seconds_float))
@@ -398,32 +402,43 @@ class CircularTimerWidget(QWidget):
                 time_text = f"{minutes:02}:{seconds:02}"
                 font_size = 40
             
-            self.web_view.page().runJavaScript(f"updateText('{time_text}', {font_size});")
+            # The text only changes on second boundaries; skip the update otherwise
+            if time_text != self._last_text:
+                self._last_text = time_text
+                self.hourglass_view.set_text(time_text, font_size)
         
-        self.update()
+        # Only repaint when the arc's end actually moved by a pixel
+        arc_pixel = self._arc_pixel()
+        if arc_pixel != self._last_arc_pixel:
+            self._last_arc_pixel = arc_pixel
+            self.update()
+
+    def _arc_pixel(self):
+        if self.total_seconds <= 0:
+            return 0
+        progress_ratio = (self.total_seconds - self.current_seconds_float) / self.total_seconds
+        return int(progress_ratio * self.arc_length_pixels())
 
     def set_inputs_visible(self, visible):
-        if not self.page_loaded: return # ADDED: Guard clause
+        if not self.animation_loaded: return # ADDED: Guard clause
         
         for widget in self.input_widgets:
             widget.setVisible(visible)
+        self._last_text = None
+        self._last_arc_pixel = None
         
         if visible:
-            self.web_view.hide()
-            self.web_view.page().runJavaScript("stopAnimation();")
-            self.web_view.page().runJavaScript("updateText('', 0);")
+            self.hourglass_view.hide()
+            self.hourglass_view.stop()
         else:
-            self.web_view.show()
-            self.web_view.page().runJavaScript("playAnimation();")
+            self.hourglass_view.show()
+            self.hourglass_view.play()
         self.update()
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        rect = self.rect()
-        side = min(rect.width(), rect.height())
-        margin = 15
-        drawing_rect = QRectF((rect.width() - side) / 2 + margin, (rect.height() - side) / 2 + margin, side - 2 * margin, side - 2 * margin)
+        drawing_rect = self._drawing_rect()
         
         painter.setPen(QPen(QColor("#3c3c3c"), 12, Qt.PenStyle.SolidLine))
         painter.drawEllipse(drawing_rect)
@@ -565,15 +580,23 @@ class Ui_BlockerApp(object):
         list_page_layout.addWidget(QLabel('Enter domain to block:'))
         add_url_layout = QHBoxLayout()
         self.url_input = QLineEdit()
-        self.url_input.setPlaceholderText("Ex: google.com")
+        self.url_input.setPlaceholderText("Ex: google.com ou *.google.com")
         self.add_url_button = QPushButton("Adicionar")
         add_url_layout.addWidget(self.url_input)
         add_url_layout.addWidget(self.add_url_button)
         list_page_layout.addLayout(add_url_layout)
-        self.website_list_widget = QListWidget()
+        self.url_filter_input = QLineEdit()
+        self.url_filter_input.setPlaceholderText("Filtrar lista...")
+        list_page_layout.addWidget(self.url_filter_input)
+        self.website_list_model = BlockListModel()
+        self.website_list_view = create_block_list_view(self.website_list_model)
         self.remove_url_button = QPushButton("Remover Selecionado")
-        list_page_layout.addWidget(self.website_list_widget)
-        list_page_layout.addWidget(self.remove_url_button)
+        self.import_urls_button = QPushButton("Importar Lista...")
+        list_page_layout.addWidget(self.website_list_view)
+        url_buttons_layout = QHBoxLayout()
+        url_buttons_layout.addWidget(self.remove_url_button)
+        url_buttons_layout.addWidget(self.import_urls_button)
+        list_page_layout.addLayout(url_buttons_layout)
         line = QWidget()
         line.setFixedHeight(1)
         line.setStyleSheet("background-color: #555;")
@@ -586,9 +609,10 @@ class Ui_BlockerApp(object):
         add_app_layout.addWidget(self.app_input)
         add_app_layout.addWidget(self.add_app_button)
         list_page_layout.addLayout(add_app_layout)
-        self.app_list_widget = QListWidget()
+        self.app_list_model = BlockListModel()
+        self.app_list_view = create_block_list_view(self.app_list_model)
         self.remove_app_button = QPushButton("Remover Selecionado")
-        list_page_layout.addWidget(self.app_list_widget)
+        list_page_layout.addWidget(self.app_list_view)
         list_page_layout.addWidget(self.remove_app_button)
         self.enable_checkbox = QCheckBox('Enable Blockers')
         self.apply_button = QPushButton('Apply Blocking Changes')
@@ -599,6 +623,20 @@ class Ui_BlockerApp(object):
 
         history_tab = QWidget()
         history_layout = QVBoxLayout(history_tab)
+        history_controls_layout = QHBoxLayout()
+        self.history_older_button = QPushButton("<")
+        self.history_newer_button = QPushButton(">")
+        self.history_page_label = QLabel()
+        self.history_page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.history_zoom_combo = QComboBox()
+        self.history_zoom_combo.addItem("Dias", ZOOM_DAYS)
+        self.history_zoom_combo.addItem("Semanas", ZOOM_WEEKS)
+        self.history_zoom_combo.addItem("Meses", ZOOM_MONTHS)
+        history_controls_layout.addWidget(self.history_older_button)
+        history_controls_layout.addWidget(self.history_page_label, 1)
+        history_controls_layout.addWidget(self.history_newer_button)
+        history_controls_layout.addWidget(self.history_zoom_combo)
+        history_layout.addLayout(history_controls_layout)
         self.history_graph = HistoryGraph()
         history_layout.addWidget(self.history_graph)
         self.tabs.addTab(history_tab, "Estatísticas")
@@ -606,6 +644,13 @@ class Ui_BlockerApp(object):
         rank_tab = QWidget()
         rank_layout = QVBoxLayout(rank_tab)
         rank_layout.setContentsMargins(0, 10, 0, 0)
+        self.ranking_period_combo = QComboBox()
+        self.ranking_period_combo.addItem("Hoje", "today")
+        self.ranking_period_combo.addItem("Semana", "week")
+        self.ranking_period_combo.addItem("365 dias", "365d")
+        self.ranking_period_combo.addItem("Total", "all")
+        self.ranking_period_combo.setCurrentIndex(2)
+        rank_layout.addWidget(self.ranking_period_combo)
         self.ranking_table_widget = QTableWidget()
         self.ranking_table_widget.setObjectName("ranking_table_widget")
         rank_layout.addWidget(self.ranking_table_widget)
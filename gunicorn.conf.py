@@ -0,0 +1,26 @@
+# gunicorn.conf.py
+# Uso: gunicorn -c gunicorn.conf.py wsgi:app
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+
+# Um processo com várias threads: os rankings em memória ficam exatos (todas as
+# escritas passam pelo mesmo processo) e o trabalho pesado de CPU, o hash de
+# senhas, já roda no pool de processos de password_pool.py, fora do GIL.
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+worker_class = "gthread"
+threads = int(os.environ.get("THREADS", 16))
+
+# Com mais de um processo, cada um só vê as próprias escritas nos rankings em
+# memória: passam a ser recarregados do banco periodicamente (ver server.default_config).
+if workers > 1:
+    raw_env = [f"LEADERBOARD_REFRESH_SECONDS={os.environ.get('LEADERBOARD_REFRESH_SECONDS', 30)}"]
+
+timeout = 30
+graceful_timeout = 20
+keepalive = 5 # O cliente reaproveita conexões (ApiClient); mantém-nas abertas entre as chamadas
+
+# O log de acesso é o log por requisição (amostrado) do próprio servidor
+accesslog = None
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info").lower()
@@ -1,113 +1,305 @@
 # history_graph.py
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtGui import QPainter, QColor, QFont
-from PyQt6.QtCore import QRect, QDate, Qt
-from datetime import datetime, timedelta
+from PyQt6.QtGui import QPainter, QColor, QFont, QPixmap
+from PyQt6.QtCore import QRect, QDateTime, QTime, QTimer, Qt, pyqtSignal
+from datetime import date, timedelta
 
 SQUARE_SIZE = 15
 SQUARE_SPACING = 4
+CELL_PITCH = SQUARE_SIZE + SQUARE_SPACING
 # Define the height of the graph grid
 GRAPH_HEIGHT = 7 * (SQUARE_SIZE + SQUARE_SPACING)
 TEXT_AREA_HEIGHT = 40 # Reserve space for the text below the graph
+NUM_COLUMNS = 53 # A year fits into 52 weeks and a few days
+NUM_DAYS = 366
+YEARS_PER_PAGE = 7 # Week and month views show one year per row, as many rows as the day view has
+YEAR_LABEL_WIDTH = 44
+COLOR_LEVELS = 32 # Number of distinct shades between the lightest and darkest blue
+EMPTY_COLOR = QColor("#3c3c3c")
+
+ZOOM_DAYS = "day"
+ZOOM_WEEKS = "week"
+ZOOM_MONTHS = "month"
+# Zoom level -> (number of columns, cell width, width reserved for the year labels)
+LAYOUTS = {
+    ZOOM_DAYS: (NUM_COLUMNS, SQUARE_SIZE, 0),
+    ZOOM_WEEKS: (NUM_COLUMNS, SQUARE_SIZE, YEAR_LABEL_WIDTH),
+    ZOOM_MONTHS: (12, 4 * SQUARE_SIZE + 3 * SQUARE_SPACING, YEAR_LABEL_WIDTH),
+}
+
+def _level_color(level):
+    """Interpolate from a light blue (level 1) to a dark blue (level COLOR_LEVELS)."""
+    progress = level / COLOR_LEVELS
+    return QColor(40, int(80 + (100 * progress)), int(150 + (105 * progress)))
 
 class HistoryGraph(QWidget):
+    """
+    Heatmap of focus time, zoomable between days, weeks and months and pageable
+    back through the years.
+
+    The day view shows 366 days (one column per week), the week and month views
+    show YEARS_PER_PAGE years with one row per year. Totals come from a source
+    callable `source(zoom, first_key, last_key) -> {key: seconds}` (the rollup
+    tables of HistoryStore), queried only for the page on screen.
+
+    The per-cell data (grid position, colour level and tooltip) is computed once
+    per page load or day change, and the whole graph is rendered into a pixmap
+    that paintEvent just blits. The pixmap is only redrawn when the data, the
+    widget size or the current day changes, so tooltips and window exposes cost
+    a single drawPixmap.
+    """
+    page_changed = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.history_data = {}
+        self.zoom = ZOOM_DAYS
+        self.page = 0 # 0 is the page ending today, 1 the one before it, and so on
+        self._source = None
+        self._history_start = None
         self.setMouseTracking(True)
-        # Cache for hit-testing to avoid recalculating on every mouse move
-        self.squares_rects = {}
+        self._cells = []        # (column, row, level) for each cell of the page
+        self._row_labels = []   # (row, text) drawn to the left of the grid
+        self._summary = ""      # Text drawn below the grid
+        self._cells_day = None  # Day the cells were computed for
+        # Hit-testing index: (column, row) -> tooltip text, looked up arithmetically on mouse move
+        self._tooltips = {}
+        self._grid_origin = (0, 0) # Top-left pixel of the grid in the last rendered layout
+        self._pixmap = None
+        self._pixmap_key = None # (width, height, device pixel ratio, day) the pixmap was drawn for
+        # Wakes up at midnight so today's square appears without waiting for a repaint
+        self._rollover_timer = QTimer(self)
+        self._rollover_timer.setSingleShot(True)
+        self._rollover_timer.timeout.connect(self.update)
+
+    def set_source(self, source, history_start=None):
+        """Sets where totals come from and the first day with history (limits paging back)."""
+        self._source = source
+        self._history_start = history_start
+        self.refresh()
+        self.page_changed.emit()
+
+    def refresh(self):
+        """Re-reads the page on screen from the source, e.g. after a session finished."""
+        first, last = self.page_range()
+        if self._source is None:
+            self._rebuild_cells()
+            self.update()
+        else:
+            self.load_history(self._source(self.zoom, self._key(first), self._key(last)))
 
     def load_history(self, data):
-        """Loads history data and triggers a repaint."""
+        """Loads the totals of the current page ({key: seconds}) and triggers a repaint."""
         self.history_data = data
+        self._rebuild_cells()
         self.update()
 
-    def paintEvent(self, event):
-        """Draws the centered history graph and text."""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        self.squares_rects.clear() # Clear cache before redrawing
+    def set_zoom(self, zoom):
+        if zoom == self.zoom:
+            return
+        # Keep roughly the same period on screen: the page that contains the old one's last day
+        last = self.page_range()[1]
+        self.zoom = zoom
+        self.page = 0
+        while self.page_range()[0] > last:
+            self.page += 1
+        self.refresh()
+        self.page_changed.emit()
+
+    def page_older(self):
+        if self.can_page_older():
+            self.page += 1
+            self.refresh()
+            self.page_changed.emit()
+
+    def page_newer(self):
+        if self.can_page_newer():
+            self.page -= 1
+            self.refresh()
+            self.page_changed.emit()
+
+    def can_page_newer(self):
+        return self.page > 0
+
+    def can_page_older(self):
+        return self._history_start is None or self.page_range()[0] > self._history_start
+
+    def page_range(self, today=None):
+        """First and last date covered by the current page."""
+        today = today or date.today()
+        if self.zoom == ZOOM_DAYS:
+            last = today - timedelta(days=NUM_DAYS * self.page)
+            return last - timedelta(days=NUM_DAYS - 1), last
+        last_year = today.year - YEARS_PER_PAGE * self.page
+        return date(last_year - YEARS_PER_PAGE + 1, 1, 1), date(last_year, 12, 31)
+
+    def page_title(self):
+        first, last = self.page_range()
+        if self.zoom == ZOOM_DAYS:
+            return f"{first.strftime('%b %d, %Y')} - {last.strftime('%b %d, %Y')}"
+        return f"{first.year} - {last.year}"
+
+    def _key(self, day):
+        """Key of the rollup row that contains `day` for the current zoom level."""
+        if self.zoom == ZOOM_MONTHS:
+            return day.strftime("%Y-%m")
+        return day.isoformat()
+
+    def _rebuild_cells(self):
+        today = date.today()
+        first, last = self.page_range(today)
+        if self.zoom == ZOOM_DAYS:
+            entries = self._day_entries(first, last)
+        elif self.zoom == ZOOM_WEEKS:
+            entries = self._week_entries(first, min(last, today))
+        else:
+            entries = self._month_entries(first, min(last, today))
 
-        today = datetime.now()
         # Use 'or [1]' to prevent error on max() with an empty sequence
         max_value = max(self.history_data.values() or [1])
-        
-        # Calculate the total number of columns
-        num_columns = 53 # A year fits into 52 weeks and a few days
+        cells = []
+        tooltips = {}
+        for column, row, key, tooltip in entries:
+            value = self.history_data.get(key, 0)
+            if value <= 0:
+                level = 0
+            else:
+                # Cap progress at 1.0; any focus at all gets at least the lightest shade
+                level = max(1, round(min(value / max_value, 1.0) * COLOR_LEVELS))
+            cells.append((column, row, level))
+            tooltips[(column, row)] = tooltip.format(minutes=value // 60)
+        self._cells = cells
+        self._tooltips = tooltips
+        if self.zoom == ZOOM_DAYS:
+            self._row_labels = []
+        else:
+            self._row_labels = [(row, str(first.year + row)) for row in range(YEARS_PER_PAGE)]
 
-        # Calculate the total width and height of the grid
-        total_graph_width = num_columns * (SQUARE_SIZE + SQUARE_SPACING)
-        total_content_height = GRAPH_HEIGHT + TEXT_AREA_HEIGHT
+        if self.zoom == ZOOM_DAYS and self.page == 0:
+            today_minutes = self.history_data.get(today.isoformat(), 0) // 60
+            self._summary = f"Today ({today.strftime('%B %d')}): {today_minutes} minutes of focus"
+        else:
+            total_hours = sum(self.history_data.values()) / 3600
+            self._summary = f"{self.page_title()}: {total_hours:.1f} hours of focus"
 
-        # Calculate horizontal and vertical offsets for centering
-        x_offset = (self.width() - total_graph_width) / 2
-        y_offset = (self.height() - total_content_height) / 2
-        
+        self._cells_day = today
+        self._pixmap = None
+        # Next check is right after midnight
+        now = QDateTime.currentDateTime()
+        midnight = QDateTime(now.date().addDays(1), QTime(0, 0))
+        self._rollover_timer.start(max(1000, now.msecsTo(midnight) + 1000))
+
+    @staticmethod
+    def _day_entries(first, last):
+        """One cell per day, one column per week, the last day in the last column."""
+        span = (last - first).days
+        for i in range(span, -1, -1): # Iterate backwards to draw from left to right
+            day = last - timedelta(days=i)
+            day_of_week = day.weekday() # Monday is 0
+            week_index = (day_of_week + i) // 7
+            column = NUM_COLUMNS - 1 - week_index
+            yield column, day_of_week, day.isoformat(), f"{{minutes}} minutes on {day.strftime('%B %d, %Y')}"
+
+    @staticmethod
+    def _week_entries(first, last):
+        """One row per year, one cell per week; a week belongs to the year of its Monday."""
+        monday = first + timedelta(days=(7 - first.weekday()) % 7)
+        while monday <= last:
+            column = (monday.timetuple().tm_yday - 1) // 7
+            row = monday.year - first.year
+            yield column, row, monday.isoformat(), f"{{minutes}} minutes in the week of {monday.strftime('%B %d, %Y')}"
+            monday += timedelta(days=7)
+
+    @staticmethod
+    def _month_entries(first, last):
+        """One row per year, one cell per month."""
+        for year in range(first.year, last.year + 1):
+            last_month = last.month if year == last.year else 12
+            for month in range(1, last_month + 1):
+                month_date = date(year, month, 1)
+                yield month - 1, year - first.year, month_date.strftime("%Y-%m"), f"{{minutes}} minutes in {month_date.strftime('%B %Y')}"
+
+    def _offsets(self):
+        """Top-left corner of the grid, centering graph and text in the widget."""
+        num_columns, cell_width, label_width = LAYOUTS[self.zoom]
+        total_graph_width = label_width + num_columns * (cell_width + SQUARE_SPACING)
+        total_content_height = GRAPH_HEIGHT + TEXT_AREA_HEIGHT
         # Ensure offsets aren't negative if the window is smaller than the graph
-        x_offset = max(0, x_offset)
-        y_offset = max(0, y_offset)
-
-        # Draw the squares for the last 366 days
-        for i in range(365, -1, -1): # Iterate backwards to draw from left to right
-            date = today - timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            
-            # This is day number from the start of the year (1-366)
-            day_of_year = date.timetuple().tm_yday
-            # Correctly calculate the week number and day of week
-            week_index = (date.weekday() + (today - date).days) // 7
-            day_of_week = date.weekday() # Monday is 0
-
-            # Today's column is the last one
-            column = num_columns - 1 - week_index
-            
-            x = x_offset + column * (SQUARE_SIZE + SQUARE_SPACING)
-            y = y_offset + day_of_week * (SQUARE_SIZE + SQUARE_SPACING)
-
-            value = self.history_data.get(date_str, 0)
-            if value == 0:
-                color = QColor("#3c3c3c")
-            else:
-                progress = min(value / max_value, 1.0) # Cap progress at 1.0
-                # Interpolate color from a light blue to a dark blue
-                r = 40
-                g = int(80 + (100 * progress))
-                b = int(150 + (105 * progress))
-                color = QColor(r, g, b)
-            
-            painter.setBrush(color)
-            painter.setPen(Qt.PenStyle.NoPen)
-            rect = QRect(int(x), int(y), SQUARE_SIZE, SQUARE_SIZE)
-            painter.drawRect(rect)
-            # Store the rect and its corresponding date string for tooltips
-            self.squares_rects[rect] = date_str
-            
-        # Draw the text information with the vertical offset
-        today_str = today.strftime("%Y-%m-%d")
-        today_seconds = self.history_data.get(today_str, 0)
-        today_minutes = today_seconds // 60
-        display_text = f"Today ({today.strftime('%B %d')}): {today_minutes} minutes of focus"
+        x_offset = max(0, (self.width() - total_graph_width) // 2)
+        y_offset = max(0, (self.height() - total_content_height) // 2)
+        return x_offset + label_width, y_offset
+
+    def _render(self, ratio):
+        """Draws the graph and text into a new pixmap and records where the grid starts."""
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+
+        _, cell_width, label_width = LAYOUTS[self.zoom]
+        pitch_x = cell_width + SQUARE_SPACING
+        x_offset, y_offset = self._offsets()
+        self._grid_origin = (x_offset, y_offset)
+        # Group squares by shade so the brush changes at most COLOR_LEVELS + 1 times
+        rects_by_level = {}
+        for column, row, level in self._cells:
+            rect = QRect(x_offset + column * pitch_x, y_offset + row * CELL_PITCH, cell_width, SQUARE_SIZE)
+            rects_by_level.setdefault(level, []).append(rect)
+        for level, rects in rects_by_level.items():
+            painter.setBrush(_level_color(level) if level else EMPTY_COLOR)
+            painter.drawRects(rects)
 
+        painter.setPen(QColor("#a9a9a9"))
+        if self._row_labels:
+            painter.setFont(QFont("Segoe UI", 9))
+            for row, text in self._row_labels:
+                label_rect = QRect(x_offset - label_width, y_offset + row * CELL_PITCH, label_width - SQUARE_SPACING, SQUARE_SIZE)
+                painter.drawText(label_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, text)
+
+        # Draw the text information with the vertical offset
         text_y_position = y_offset + GRAPH_HEIGHT + 10
-        text_rect = QRect(0, int(text_y_position), self.width(), 30)
+        text_rect = QRect(0, text_y_position, self.width(), 30)
 
         font = QFont("Segoe UI", 14)
         painter.setFont(font)
-        painter.setPen(QColor("#a9a9a9"))
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, display_text)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, self._summary)
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        """Blits the cached graph, redrawing it first if the size or the day changed."""
+        if self._cells_day != date.today():
+            self.refresh()
+        ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), ratio, self._cells_day)
+        if self._pixmap is None or self._pixmap_key != key:
+            self._pixmap = self._render(ratio)
+            self._pixmap_key = key
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._pixmap)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._pixmap = None
+
+    def cell_at(self, pos):
+        """(column, row) of the cell under `pos`, or None over the gaps or outside the grid."""
+        _, cell_width, _ = LAYOUTS[self.zoom]
+        x = pos.x() - self._grid_origin[0]
+        y = pos.y() - self._grid_origin[1]
+        if x < 0 or y < 0:
+            return None
+        column, x_in_cell = divmod(x, cell_width + SQUARE_SPACING)
+        row, y_in_cell = divmod(y, CELL_PITCH)
+        if x_in_cell >= cell_width or y_in_cell >= SQUARE_SIZE:
+            return None
+        return column, row
 
     def mouseMoveEvent(self, event):
-        """Handle tooltips by checking if the mouse is inside any cached rect."""
-        pos = event.pos()
-        # Find which square the mouse is over
-        for rect, date_str in self.squares_rects.items():
-            if rect.contains(pos):
-                value_seconds = self.history_data.get(date_str, 0)
-                minutes = value_seconds // 60
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                self.setToolTip(f"{minutes} minutes on {date_obj.strftime('%B %d, %Y')}")
-                return # Exit after finding the first match
-        
-        # If no square is found, clear the tooltip
-        self.setToolTip("")
\ No newline at end of file
+        """Shows the tooltip of the cell under the cursor, found in constant time."""
+        cell = self.cell_at(event.pos())
+        tooltip = self._tooltips.get(cell, "") if cell is not None else ""
+        if tooltip != self.toolTip():
+            self.setToolTip(tooltip)
@@ -0,0 +1,180 @@
+# history_store.py
+import json
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT UNIQUE,
+    started_at REAL NOT NULL,
+    ended_at REAL NOT NULL,
+    duration_seconds INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    room TEXT,
+    synced INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions (day);
+CREATE INDEX IF NOT EXISTS sessions_unsynced ON sessions (synced) WHERE synced = 0;
+CREATE TABLE IF NOT EXISTS daily_totals (
+    day TEXT PRIMARY KEY,
+    seconds INTEGER NOT NULL,
+    sessions INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS weekly_totals (
+    week TEXT PRIMARY KEY, -- Segunda-feira da semana, AAAA-MM-DD
+    seconds INTEGER NOT NULL,
+    sessions INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS monthly_totals (
+    month TEXT PRIMARY KEY, -- AAAA-MM
+    seconds INTEGER NOT NULL,
+    sessions INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Nível de zoom -> (tabela de totais, coluna-chave)
+ROLLUPS = {
+    'day': ('daily_totals', 'day'),
+    'week': ('weekly_totals', 'week'),
+    'month': ('monthly_totals', 'month'),
+}
+ROLLUPS_VERSION = "1"
+
+def rollup_keys(day):
+    """Chaves de dia, semana (segunda-feira) e mês para uma data 'AAAA-MM-DD'."""
+    day_date = date.fromisoformat(day)
+    monday = day_date - timedelta(days=day_date.weekday())
+    return {'day': day, 'week': monday.isoformat(), 'month': day[:7]}
+
+class HistoryStore:
+    """
+    Histórico local de sessões de foco em SQLite (modo WAL).
+
+    Cada sessão é uma linha em `sessions`; `daily_totals`, `weekly_totals` e
+    `monthly_totals` guardam as somas por dia, semana e mês, atualizadas na mesma
+    transação que insere a sessão. Registrar uma sessão é, portanto, um INSERT e
+    três UPSERTs, e o gráfico lê só o intervalo que mostra, pela chave primária
+    da tabela do nível de zoom, sem nunca percorrer as sessões.
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Com WAL, NORMAL não corrompe o banco num crash; no pior caso perde a última transação
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._backfill_rollups()
+
+    @staticmethod
+    def day_for(timestamp):
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+
+    def record_session(self, session_id, started_at, ended_at, duration_seconds, room=None, synced=False):
+        """Grava uma sessão e soma a duração ao dia em que ela terminou."""
+        day = self.day_for(ended_at)
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO sessions (session_id, started_at, ended_at, duration_seconds, day, room, synced) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session_id, started_at, ended_at, duration_seconds, day, room, int(synced))
+            )
+            if cursor.rowcount:
+                self._add_to_rollups(day, duration_seconds, 1)
+
+    def _add_to_rollups(self, day, seconds, sessions):
+        for level, key in rollup_keys(day).items():
+            table, column = ROLLUPS[level]
+            self.conn.execute(
+                f"INSERT INTO {table} ({column}, seconds, sessions) VALUES (?, ?, ?) "
+                f"ON CONFLICT({column}) DO UPDATE SET seconds = seconds + excluded.seconds, sessions = sessions + excluded.sessions",
+                (key, seconds, sessions)
+            )
+
+    def _backfill_rollups(self):
+        """Bancos criados antes dos totais semanais/mensais: gera-os uma vez a partir de daily_totals."""
+        if self._get_meta('rollups_version') == ROLLUPS_VERSION:
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM weekly_totals")
+            self.conn.execute("DELETE FROM monthly_totals")
+            # 'weekday 0' avança até o domingo (ou fica nele); -6 dias volta à segunda-feira
+            self.conn.execute(
+                "INSERT INTO weekly_totals (week, seconds, sessions) "
+                "SELECT date(day, 'weekday 0', '-6 days'), SUM(seconds), SUM(sessions) FROM daily_totals GROUP BY 1"
+            )
+            self.conn.execute(
+                "INSERT INTO monthly_totals (month, seconds, sessions) "
+                "SELECT substr(day, 1, 7), SUM(seconds), SUM(sessions) FROM daily_totals GROUP BY 1"
+            )
+            self._set_meta('rollups_version', ROLLUPS_VERSION)
+
+    def mark_synced(self, session_ids):
+        """Marca como enviadas ao servidor as sessões com estes IDs."""
+        with self.conn:
+            self.conn.executemany("UPDATE sessions SET synced = 1 WHERE session_id = ?", ((sid,) for sid in session_ids))
+
+    def totals(self, level, first_key, last_key):
+        """{chave: segundos} do nível 'day', 'week' ou 'month' entre as duas chaves (inclusive)."""
+        table, column = ROLLUPS[level]
+        rows = self.conn.execute(
+            f"SELECT {column}, seconds FROM {table} WHERE {column} BETWEEN ? AND ?",
+            (first_key, last_key)
+        )
+        return dict(rows)
+
+    def daily_totals(self, first_day, last_day):
+        """{'AAAA-MM-DD': segundos} para os dias com foco entre first_day e last_day (inclusive)."""
+        return self.totals('day', first_day, last_day)
+
+    def recent_days(self, days=366, today=None):
+        """Totais dos últimos `days` dias, no formato que HistoryGraph.load_history espera."""
+        today = today or date.today()
+        first_day = today - timedelta(days=days - 1)
+        return self.daily_totals(first_day.isoformat(), today.isoformat())
+
+    def first_day(self):
+        """Primeiro dia com foco registrado, ou None se o histórico estiver vazio."""
+        row = self.conn.execute("SELECT MIN(day) FROM daily_totals").fetchone()
+        return date.fromisoformat(row[0]) if row and row[0] else None
+
+    def migrate_json(self, json_path):
+        """
+        Importa uma única vez o antigo blocker_history.json ({dia: segundos}). Os totais
+        entram direto nas tabelas de totais, já que o arquivo não tinha as sessões individuais.
+        """
+        if self._get_meta('json_migrated') or not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"*** AVISO: Não foi possível migrar o histórico antigo: {e}")
+            data = {}
+        with self.conn:
+            for day, seconds in data.items():
+                if isinstance(seconds, (int, float)) and seconds > 0:
+                    try:
+                        self._add_to_rollups(day, int(seconds), 0)
+                    except ValueError:
+                        continue # Chave que não é uma data
+            self._set_meta('json_migrated', str(int(time.time())))
+        os.replace(json_path, json_path + ".migrated")
+        print(f">>> Histórico antigo migrado: {len(data)} dias.")
+        return len(data)
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,138 @@
+# hosts_manager.py
+import os
+import tempfile
+
+from domain_trie import WILDCARD_PREFIX
+
+class HostsManager:
+    """
+    Gerencia o bloco de linhas marcadas com `marker` no arquivo hosts.
+
+    A parte não gerenciada do arquivo e o bloco atual ficam em cache (o arquivo
+    só é relido se o mtime/tamanho mudar por fora), a escrita é pulada quando o
+    bloco calculado é igual ao atual e, quando acontece, passa por um arquivo
+    temporário + rename atômico, para que um crash nunca deixe o hosts truncado.
+    """
+    def __init__(self, hosts_path, marker, redirect_ip):
+        self.hosts_path = hosts_path
+        self.marker = marker
+        self.redirect_ip = redirect_ip
+        self._unmanaged_lines = None
+        self._managed_lines = None
+        self._file_signature = None
+
+    def _signature(self):
+        stat = os.stat(self.hosts_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        signature = self._signature()
+        if signature == self._file_signature:
+            return
+        with open(self.hosts_path, 'r') as f:
+            lines = f.readlines()
+        # Garante a quebra de linha antes do bloco gerenciado
+        if lines and not lines[-1].endswith('\n'):
+            lines[-1] += '\n'
+        self._unmanaged_lines = [line for line in lines if self.marker not in line]
+        self._managed_lines = [line for line in lines if self.marker in line]
+        self._file_signature = signature
+
+    def build_block(self, blacklist, is_enabled):
+        """
+        Expande cada domínio para as versões com e sem 'www.' e monta as linhas marcadas.
+        O hosts não aceita curingas, então "*.site.com" vira só site.com e www.site.com.
+        """
+        if not is_enabled:
+            return []
+        final_blacklist = set()
+        for canonical_domain in blacklist:
+            domain_stripped = canonical_domain.strip().removeprefix(WILDCARD_PREFIX)
+            if domain_stripped:
+                final_blacklist.add(domain_stripped)           # Adiciona -> google.com
+                final_blacklist.add('www.' + domain_stripped)  # Adiciona -> www.google.com
+        return [f"{self.redirect_ip}\t{site}\t{self.marker}\n" for site in sorted(final_blacklist)]
+
+    def apply(self, blacklist, is_enabled):
+        """Atualiza o arquivo hosts. Retorna True se ele foi reescrito, False se já estava igual."""
+        self._load()
+        block = self.build_block(blacklist, is_enabled)
+        if block == self._managed_lines:
+            return False
+        self._write(self._unmanaged_lines + block)
+        self._managed_lines = block
+        self._file_signature = self._signature()
+        return True
+
+    def _write(self, lines):
+        directory = os.path.dirname(os.path.abspath(self.hosts_path))
+        fd, temp_path = tempfile.mkstemp(prefix=".hosts.", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.chmod(temp_path, os.stat(self.hosts_path).st_mode & 0o7777)
+            except OSError:
+                pass
+            try:
+                os.replace(temp_path, self.hosts_path)
+            except OSError:
+                # Ex.: /etc/hosts montado como bind mount (containers) não aceita rename;
+                # neste caso resta escrever no próprio arquivo.
+                with open(self.hosts_path, 'w') as f:
+                    f.writelines(lines)
+                os.remove(temp_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+def _benchmark(num_lines=100_000, num_domains=50, rounds=5):
+    """Compara a reescrita completa antiga com o HostsManager em um hosts de `num_lines` linhas."""
+    import time
+    marker = "# MANAGED BY PYQT-BLOCKER"
+    domains = [f"site{i}.com" for i in range(num_domains)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        hosts_path = os.path.join(directory, "hosts")
+        with open(hosts_path, 'w') as f:
+            for i in range(num_lines):
+                f.write(f"0.0.0.0\tads{i}.example.net\n")
+
+        def old_update(blacklist, is_enabled):
+            with open(hosts_path, 'r') as f:
+                lines = [line for line in f if marker not in line]
+            if is_enabled:
+                final_blacklist = set()
+                for domain in blacklist:
+                    final_blacklist.add(domain)
+                    final_blacklist.add('www.' + domain)
+                for site in sorted(final_blacklist):
+                    lines.append(f"127.0.0.1\t{site}\t{marker}\n")
+            with open(hosts_path, 'w') as f:
+                f.writelines(lines)
+
+        def timed(fn):
+            started = time.perf_counter()
+            for _ in range(rounds):
+                fn()
+            return (time.perf_counter() - started) / rounds * 1000
+
+        manager = HostsManager(hosts_path, marker, "127.0.0.1")
+        print(f"hosts com {num_lines} linhas, {num_domains} domínios bloqueados (média de {rounds} rodadas)")
+        print(f"  antigo, reescrita completa:      {timed(lambda: old_update(domains, True)):8.2f} ms")
+        old_update([], False)
+        state = {'enabled': False}
+        def toggle():
+            state['enabled'] = not state['enabled']
+            manager.apply(domains, state['enabled'])
+        print(f"  HostsManager, bloco alterado:    {timed(toggle):8.2f} ms")
+        manager.apply(domains, True)
+        print(f"  HostsManager, bloco inalterado:  {timed(lambda: manager.apply(domains, True)):8.2f} ms")
+
+
+if __name__ == '__main__':
+    _benchmark()
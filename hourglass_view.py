@@ -0,0 +1,196 @@
+# hourglass_view.py
+import os
+import sys
+import json
+from PyQt6.QtCore import Qt, QUrl, QTimer, QRectF, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QImage, QPainter, QPixmap
+from PyQt6.QtWidgets import QWidget
+
+try:
+    from rlottie_python import LottieAnimation
+except ImportError:
+    LottieAnimation = None
+
+# "native" renders data/hourglass.json with rlottie + QPainter; "webengine" uses
+# the old lottie_player.html inside a QWebEngineView (a whole Chromium process).
+# "native" falls back to "webengine" when rlottie is not installed.
+ANIMATION_BACKEND = os.environ.get("HOURCLASS_ANIMATION_BACKEND", "native")
+
+TEXT_COLOR = QColor("#f0f0f0")
+
+def resource_path(relative_path):
+    if getattr(sys, 'frozen', False):
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, relative_path)
+
+
+class NativeHourglassView(QWidget):
+    """
+    Draws the hourglass with QPainter from frames pre-rasterised by rlottie.
+    Frames are rendered once per widget size and kept as QPixmaps, so playing
+    the animation is just a blit per frame; the frame timer only runs while
+    the animation is playing and the widget is visible.
+    """
+    loaded = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.animation = LottieAnimation.from_file(resource_path("data/hourglass.json"))
+        self.total_frames = self.animation.lottie_animation_get_totalframe()
+        fps = self.animation.lottie_animation_get_framerate() or 30
+        self.frame_cache = {} # (width, height) -> [QPixmap | None] * total_frames
+        self.current_frame = 0
+        self.text = ""
+        self.font_size = 0
+        self.playing = False
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setInterval(int(1000 / fps))
+        self.frame_timer.timeout.connect(self._next_frame)
+
+        # Same contract as the WebEngine view: announce readiness asynchronously
+        QTimer.singleShot(0, self.loaded.emit)
+
+    def play(self):
+        self.playing = True
+        if self.isVisible():
+            self.frame_timer.start()
+
+    def stop(self):
+        self.playing = False
+        self.frame_timer.stop()
+        self.current_frame = 0
+        self.text = ""
+        self.update()
+
+    def set_text(self, text, font_size):
+        self.text = text
+        self.font_size = font_size
+        self.update()
+
+    def refresh_size(self):
+        # Frames for other sizes are useless once the widget has been resized
+        self.frame_cache = {key: frames for key, frames in self.frame_cache.items() if key == self._frame_key()}
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.playing:
+            self.frame_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.frame_timer.stop()
+
+    def _next_frame(self):
+        self.current_frame = (self.current_frame + 1) % self.total_frames
+        self.update()
+
+    def _frame_key(self):
+        ratio = self.devicePixelRatioF()
+        side = min(self.width(), self.height())
+        return int(side * ratio), int(side * ratio)
+
+    def _frame(self, index):
+        key = self._frame_key()
+        if key[0] <= 0:
+            return None
+        frames = self.frame_cache.setdefault(key, [None] * self.total_frames)
+        if frames[index] is None:
+            width, height = key
+            buffer = self.animation.lottie_animation_render(frame_num=index, width=width, height=height)
+            # rlottie renders premultiplied BGRA, i.e. Qt's native ARGB32 on little-endian
+            image = QImage(buffer, width, height, width * 4, QImage.Format.Format_ARGB32_Premultiplied).copy()
+            pixmap = QPixmap.fromImage(image)
+            pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+            frames[index] = pixmap
+        return frames[index]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        side = min(self.width(), self.height())
+        target = QRectF((self.width() - side) / 2, (self.height() - side) / 2, side, side)
+
+        pixmap = self._frame(self.current_frame)
+        if pixmap is not None:
+            painter.drawPixmap(target.toRect(), pixmap)
+
+        if self.text:
+            font = QFont("Segoe UI")
+            font.setPixelSize(self.font_size)
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(TEXT_COLOR)
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.text)
+
+
+class WebEngineHourglassView(QWidget):
+    """Fallback: the original Lottie web player running inside a QWebEngineView."""
+    loaded = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Imported here so the native backend never loads Chromium at all
+        from PyQt6.QtWebEngineWidgets import QWebEngineView
+        from PyQt6.QtWebEngineCore import QWebEngineSettings
+
+        self.web_view = QWebEngineView(self)
+        self.web_view.settings().setAttribute(QWebEngineSettings.WebAttribute.ShowScrollBars, False)
+        self.web_view.page().setBackgroundColor(Qt.GlobalColor.transparent)
+        self.web_view.setUrl(QUrl.fromLocalFile(resource_path("lottie_player.html")))
+        self.web_view.loadFinished.connect(self._on_load_finished)
+
+    def _on_load_finished(self, success):
+        if not success:
+            print("Error: Could not load lottie_player.html")
+            return
+
+        # The page loads data/hourglass.min.js (see build_assets.py) by itself;
+        # Python only steps in if that generated file is missing.
+        self.web_view.page().runJavaScript("!!window.HOURGLASS_ANIMATION", self._on_animation_checked)
+
+    def _on_animation_checked(self, has_animation):
+        if not has_animation:
+            print("Warning: data/hourglass.min.js not found; run build_assets.py. Loading the raw JSON instead.")
+            try:
+                with open(resource_path("data/hourglass.json"), 'r', encoding='utf-8') as f:
+                    # json.dumps of the raw text yields a safe JS string literal (no backtick issues)
+                    self.web_view.page().runJavaScript(f"loadAnimation({json.dumps(f.read())});")
+            except OSError as e:
+                print(f"Error loading animation data: {e}")
+
+        self.loaded.emit()
+
+    def play(self):
+        self.web_view.page().runJavaScript("playAnimation();")
+
+    def stop(self):
+        self.web_view.page().runJavaScript("stopAnimation();")
+        self.web_view.page().runJavaScript("updateText('', 0);")
+
+    def set_text(self, text, font_size):
+        self.web_view.page().runJavaScript(f"updateText('{text}', {font_size});")
+
+    def refresh_size(self):
+        self.web_view.page().runJavaScript("resizeAnimation();")
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.web_view.setGeometry(self.rect())
+
+
+def create_hourglass_view(parent=None, backend=None):
+    """Creates the hourglass view for the configured backend, falling back to WebEngine."""
+    backend = backend or ANIMATION_BACKEND
+    if backend == "native":
+        if LottieAnimation is not None:
+            try:
+                return NativeHourglassView(parent)
+            except Exception as e:
+                print(f"Native hourglass unavailable ({e}); falling back to WebEngine.")
+        else:
+            print("rlottie-python not installed; falling back to WebEngine.")
+    return WebEngineHourglassView(parent)
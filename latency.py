@@ -0,0 +1,58 @@
+# latency.py
+from bisect import bisect_left
+from threading import Lock
+
+# Limites superiores dos baldes, em milissegundos; o último balde pega o resto
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class LatencyHistogram:
+    """
+    Histograma de latência por endpoint, com baldes fixos: registrar uma
+    requisição é um bisect e um incremento, sem guardar as amostras.
+    Os percentis são estimados pelo limite superior do balde onde caem.
+    """
+    def __init__(self, buckets_ms=BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._endpoints = {} # endpoint -> {'counts': [...], 'count', 'sum_seconds', 'max_seconds'}
+        self._lock = Lock()
+
+    def observe(self, endpoint, seconds):
+        index = bisect_left(self.buckets_ms, seconds * 1000)
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = self._endpoints[endpoint] = {
+                    'counts': [0] * (len(self.buckets_ms) + 1), 'count': 0, 'sum_seconds': 0.0, 'max_seconds': 0.0
+                }
+            entry['counts'][index] += 1
+            entry['count'] += 1
+            entry['sum_seconds'] += seconds
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+
+    def _percentile_ms(self, counts, total, fraction):
+        target = fraction * total
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= target:
+                return self.buckets_ms[index] if index < len(self.buckets_ms) else None # None = acima do último balde
+        return None
+
+    def snapshot(self):
+        """{endpoint: {baldes 'le_<ms>'/'inf', count, avg/max, p50/p95/p99 estimados}}."""
+        with self._lock:
+            endpoints = {name: dict(entry, counts=list(entry['counts'])) for name, entry in self._endpoints.items()}
+        result = {}
+        labels = [f"le_{bound}" for bound in self.buckets_ms] + ["inf"]
+        for name, entry in endpoints.items():
+            counts, total = entry['counts'], entry['count']
+            result[name] = {
+                'buckets_ms': dict(zip(labels, counts)),
+                'count': total,
+                'avg_ms': entry['sum_seconds'] * 1000 / total,
+                'max_ms': entry['max_seconds'] * 1000,
+                'p50_ms': self._percentile_ms(counts, total, 0.50),
+                'p95_ms': self._percentile_ms(counts, total, 0.95),
+                'p99_ms': self._percentile_ms(counts, total, 0.99),
+            }
+        return result
@@ -0,0 +1,110 @@
+# leaderboard.py
+import hashlib
+import json
+from bisect import bisect_left, insort
+from threading import Lock
+
+TOP_SIZE = 100
+
+class Leaderboard:
+    """
+    Ranking mantido em memória, ordenado por tempo total (desc) e nome.
+    Cada atualização custa um bisect + memmove; o top 100 é servido de um
+    cache que só é reconstruído quando alguma posição do top muda, junto com
+    o JSON já serializado e um ETag derivado do conteúdo.
+    """
+    def __init__(self, top_size=TOP_SIZE):
+        self.top_size = top_size
+        self._totals = {}    # username -> total_seconds
+        self._entries = []   # lista ordenada de (-total_seconds, username)
+        self._top_cache = None
+        self._top_snapshot = None # (etag, corpo JSON) do top, mesmo ciclo de vida de _top_cache
+        self._lock = Lock()
+
+    def load(self, rows):
+        """Carrega (username, total_seconds) de uma só vez, ex.: na inicialização."""
+        with self._lock:
+            self._totals = {username: total or 0 for username, total in rows}
+            self._entries = sorted((-total, username) for username, total in self._totals.items())
+            self._top_cache = self._top_snapshot = None
+
+    def set_total(self, username, total_seconds):
+        """Atualiza o total de um usuário (novo ou existente)."""
+        with self._lock:
+            self._set_total_locked(username, total_seconds or 0)
+
+    def _set_total_locked(self, username, total_seconds):
+        old_total = self._totals.get(username)
+        if old_total == total_seconds:
+            return
+        if old_total is not None:
+            old_index = bisect_left(self._entries, (-old_total, username))
+            del self._entries[old_index]
+            if old_index < self.top_size:
+                self._top_cache = self._top_snapshot = None
+        self._totals[username] = total_seconds
+        entry = (-total_seconds, username)
+        insort(self._entries, entry)
+        if self._top_cache is not None and bisect_left(self._entries, entry) < self.top_size:
+            self._top_cache = self._top_snapshot = None
+
+    def total(self, username):
+        with self._lock:
+            return self._totals.get(username)
+
+    def add(self, username, seconds):
+        """Soma (ou subtrai, com `seconds` negativo) ao total atual do usuário."""
+        with self._lock:
+            self._set_total_locked(username, self._totals.get(username, 0) + seconds)
+
+    def remove(self, username):
+        with self._lock:
+            total = self._totals.pop(username, None)
+            if total is None:
+                return
+            index = bisect_left(self._entries, (-total, username))
+            del self._entries[index]
+            if index < self.top_size:
+                self._top_cache = self._top_snapshot = None
+
+    def _slice(self, start, stop):
+        return [
+            {'rank': i + 1, 'username': username, 'total_seconds': -neg_total}
+            for i, (neg_total, username) in enumerate(self._entries[start:stop], start=start)
+        ]
+
+    def top(self):
+        """Retorna o top N já serializável. O resultado é compartilhado: não modifique."""
+        with self._lock:
+            if self._top_cache is None:
+                self._top_cache = self._slice(0, self.top_size)
+            return self._top_cache
+
+    def top_snapshot(self):
+        """
+        (etag, corpo JSON em bytes) do top N. O ETag é um hash do conteúdo, então é o
+        mesmo em qualquer processo que tenha o mesmo ranking.
+        """
+        with self._lock:
+            if self._top_snapshot is None:
+                if self._top_cache is None:
+                    self._top_cache = self._slice(0, self.top_size)
+                body = json.dumps(self._top_cache, separators=(',', ':')).encode('utf-8')
+                self._top_snapshot = (hashlib.sha1(body).hexdigest(), body)
+            return self._top_snapshot
+
+    def around(self, username, radius=5):
+        """
+        Retorna (posição, vizinhos) do usuário, sem varrer a tabela.
+        Retorna (None, []) se o usuário não estiver no ranking.
+        """
+        with self._lock:
+            total = self._totals.get(username)
+            if total is None:
+                return None, []
+            index = bisect_left(self._entries, (-total, username))
+            start = max(0, index - radius)
+            return index + 1, self._slice(start, index + radius + 1)
+
+    def __len__(self):
+        return len(self._totals)
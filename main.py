@@ -7,16 +7,20 @@ import platform
 import json
 import atexit
 import uuid
+import threading
+import subprocess
 from datetime import datetime
 from urllib.parse import urlparse
 from PyQt6.QtWidgets import (QApplication, QWidget, QStyle, QDialog, QLineEdit, 
-                             QPushButton, QLabel, QFormLayout, QHBoxLayout, QVBoxLayout, QTableWidgetItem, QMainWindow)
-from PyQt6.QtCore import Qt, QPoint, QSize, QTimer, QDateTime, QStandardPaths
+                             QPushButton, QLabel, QFormLayout, QHBoxLayout, QVBoxLayout, QTableWidgetItem, QMainWindow, QFileDialog)
+from PyQt6.QtCore import Qt, QPoint, QSize, QTimer, QDateTime, QStandardPaths, QObject, QEvent, pyqtSignal
 from PyQt6.QtGui import QIcon, QColor, QPixmap, QPainter
 from PyQt6.QtSvg import QSvgRenderer
 
 
 SYNC_SERVER = "http://201.23.72.236:5001" # Or your server's IP address
+ROOM_POLL_TIMEOUT = 25 # Mesmo valor de LONG_POLL_TIMEOUT em cloud/sync_api.py
+MIN_TICK_MS = 16 # Intervalo mínimo entre quadros do timer (~60 fps)
 
 
 if platform.system() == "Windows":
@@ -24,6 +28,12 @@ if platform.system() == "Windows":
 
 # Importa a classe da interface do usuário do arquivo gui.py
 from gui import Ui_BlockerApp, LoginDialog, RegisterDialog, recolor_icon
+from network import run_in_background, request_json, request_json_if_changed, api_client
+from hosts_manager import HostsManager
+from history_store import HistoryStore
+from session_journal import SessionJournal
+from domain_trie import normalize_domain, load_blocklist_file
+import dns_blocker
 
 # --- FUNÇÕES AUXILIARES E CONSTANTES GLOBAIS ---
 
@@ -72,6 +82,22 @@ def recolor_icon(icon: QIcon, color: QColor) -> QIcon:
 MARKER = "# MANAGED BY PYQT-BLOCKER"
 SERVER_BASE_URL = "http://201.23.72.236:5000"
 REDIRECT_IP = "127.0.0.1"
+# "hosts" reescreve o arquivo hosts; "resolver" usa o resolvedor DNS local (dns_blocker.py),
+# que também bloqueia subdomínios e troca a lista sem reescrever arquivos.
+BLOCKING_ENGINE = os.environ.get("HOURCLASS_BLOCKING_ENGINE", "hosts")
+RESOLVER_LISTEN = "127.0.0.1:53"
+RESOLVER_CONTROL = ("127.0.0.1", 5354)
+RESOLVER_UPSTREAM = os.environ.get("HOURCLASS_DNS_UPSTREAM", "1.1.1.1:53")
+JOURNAL_FILE = "session_journal.jsonl"
+LEGACY_OUTBOX_FILE = "add_time_outbox.json" # Caixa de saída antiga, passada para o diário na inicialização
+CHECKPOINT_INTERVAL_MS = 30_000 # Tempo máximo de foco perdido se o app morrer no meio da sessão
+UPLOAD_RETRY_MIN_MS = 30_000
+OUTBOX_FLUSH_DELAY_MS = 120_000 # Sessões terminadas dentro dessa espera vão juntas no mesmo lote
+UPLOAD_RETRY_MAX_MS = 600_000
+HISTORY_DB_FILE = "blocker_history.db"
+LEGACY_HISTORY_FILE = "blocker_history.json" # Migrado para HISTORY_DB_FILE na primeira execução
+OUTBOX_BATCH_SIZE = 500 # Mesmo limite do servidor em /add_time/batch
+IMPORT_CHUNK_SIZE = 5000 # Entradas juntadas à lista de sites por volta do loop de eventos
 
 #CORES PARA RÁPIDA MODIFICAÇÃO:
 
@@ -173,7 +199,7 @@ QPushButton:disabled {{
 }}
 
 /* --- Text Inputs --- */
-QLineEdit, QListWidget, QTableWidget {{
+QLineEdit, QListView, QTableWidget {{
     background-color: {COLOR_BACKGROUND};
     border: 1px solid {COLOR_BORDER};
     padding: 6px;
@@ -229,13 +255,60 @@ QTabBar {{
 }}
 """
 
+# --- OBSERVADOR DA SALA SINCRONIZADA ---
+
+class RoomWatcher(QObject):
+    """
+    Acompanha o estado de uma sala via long-poll em /room_status?since=<versão>.
+    O servidor só responde quando a sala muda (ou após ROOM_POLL_TIMEOUT), então
+    as transições chegam em milissegundos sem polling periódico. Roda em uma
+    thread daemon e entrega os resultados na thread da interface via sinais.
+    """
+    room_updated = pyqtSignal(dict)
+    connection_lost = pyqtSignal()
+
+    def __init__(self, room_name, user_id, parent=None):
+        super().__init__(parent)
+        self.room_name = room_name
+        self.user_id = user_id
+        self._stop_event = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        version = None
+        while not self._stop_event.is_set():
+            params = {"room_name": self.room_name, "user_id": self.user_id}
+            if version is not None:
+                params["since"] = version
+            try:
+                response = api_client.get(f"{SYNC_SERVER}/room_status", params=params, timeout=ROOM_POLL_TIMEOUT + 5)
+                room_data = response.json() if response.status_code == 200 else None
+            except (requests.RequestException, ValueError):
+                room_data = None
+
+            if self._stop_event.is_set():
+                return
+            if room_data is None:
+                self.connection_lost.emit()
+                return
+            if room_data.get("version") != version:
+                version = room_data.get("version")
+                self.room_updated.emit(room_data)
+
 # --- CLASSE PRINCIPAL DA APLICAÇÃO ---
 
 class BlockerApp(QMainWindow):
-    def __init__(self, username: str):
+    def __init__(self, username: str, token: str = None):
         super().__init__()
         # Armazena o usuário logado para uso futuro
         self.logged_in_user = username
+        # Token do /login: o servidor identifica o usuário por ele, não pelo nome enviado
+        api_client.set_auth_token(SERVER_BASE_URL, token)
         
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.ui = Ui_BlockerApp()
@@ -247,6 +320,15 @@ class BlockerApp(QMainWindow):
         self._setup_title_bar_icons()
         self.old_pos = None
         self.hosts_path = self.get_hosts_path()
+        self.hosts_manager = HostsManager(self.hosts_path, MARKER, REDIRECT_IP)
+        self.resolver_process = None
+        self.resolver_generation = 0 # Versão da última lista pedida ao resolvedor
+        self.resolver_sent_generation = 0
+        self.resolver_send_lock = threading.Lock()
+        self.history_store = HistoryStore(self.get_config_path(HISTORY_DB_FILE))
+        self.history_store.migrate_json(self.get_config_path(LEGACY_HISTORY_FILE))
+        if BLOCKING_ENGINE == "resolver":
+            self.start_dns_resolver()
         if platform.system() == "Windows":
             self.helper_path = self.get_helper_path()
             self.previously_blocked_exes = set()
@@ -256,7 +338,10 @@ class BlockerApp(QMainWindow):
             self.ui.nav_button_estatisticas,
             self.ui.nav_button_rank,
         ]
+        # Single-shot: each tick schedules the next one (see schedule_next_tick)
         self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self.update_countdown)
         self.total_seconds = 0
         self.end_time = None
@@ -265,8 +350,23 @@ class BlockerApp(QMainWindow):
         self.synced_session_active = False
         self.current_room = None
         
-        self.sync_timer = QTimer(self)
-        self.sync_timer.timeout.connect(self.poll_server_status)
+        self.room_watcher = None
+        self.outbox_flush_in_progress = False
+        self.ranking_etag = None # (período, ETag) do ranking que está na tabela
+        self.journal = SessionJournal(self.get_config_path(JOURNAL_FILE))
+        self.current_session_id = None
+        self.session_started_at = None
+        self.checkpoint_timer = QTimer(self)
+        self.checkpoint_timer.setInterval(CHECKPOINT_INTERVAL_MS)
+        self.checkpoint_timer.timeout.connect(self.write_checkpoint)
+        self.upload_retry_ms = UPLOAD_RETRY_MIN_MS
+        self.upload_retry_timer = QTimer(self)
+        self.upload_retry_timer.setSingleShot(True)
+        self.upload_retry_timer.timeout.connect(self.flush_outbox)
+        self.outbox_flush_timer = QTimer(self)
+        self.outbox_flush_timer.setSingleShot(True)
+        self.outbox_flush_timer.setInterval(OUTBOX_FLUSH_DELAY_MS)
+        self.outbox_flush_timer.timeout.connect(self.flush_outbox)
         
         self.ui.connect_button.clicked.connect(self.connect_to_synced_session)
         self.ui.disconnect_button.clicked.connect(self.disconnect_from_synced_session)
@@ -279,33 +379,53 @@ class BlockerApp(QMainWindow):
         
     
     def connect_to_synced_session(self):
-        print("test")
         room_name = self.ui.room_input.text().strip()
         if not room_name:
             self.ui.sync_status_label.setText("Nome da sala é obrigatório.")
             return
 
         self.current_room = room_name
+        self.ui.connect_button.setEnabled(False)
+        self.ui.sync_status_label.setText("Conectando...")
         payload = {"room_name": self.current_room, "user_id": self.user_id}
-        try:
-            response = requests.post(f"{SYNC_SERVER}/join_room", json=payload)
-            if response.status_code == 200:
-                self.synced_session_active = True
-                self.ui.connect_button.setEnabled(False)
-                self.ui.disconnect_button.setEnabled(True)
-                self.ui.room_input.setEnabled(False)
-                self.sync_timer.start(3000) # Poll every 3 seconds
-                self.ui.sync_status_label.setText("Aguardando parceiro...")
-            else:
-                self.ui.sync_status_label.setText(f"Erro: {response.json().get('error', 'Desconhecido')}")
-        except requests.RequestException:
-            self.ui.sync_status_label.setText("Erro de conexão.")
+        run_in_background(
+            request_json, "POST", f"{SYNC_SERVER}/join_room", json=payload, idempotent=True,
+            on_success=lambda result: self.handle_join_response(room_name, *result),
+            on_error=lambda error: self.handle_join_error(room_name)
+        )
+
+    def handle_join_response(self, room_name, status_code, room_data):
+        if self.current_room != room_name or self.synced_session_active: return
+        if status_code == 200:
+            self.synced_session_active = True
+            self.ui.connect_button.setEnabled(False)
+            self.ui.disconnect_button.setEnabled(True)
+            self.ui.room_input.setEnabled(False)
+            self.start_room_watcher()
+            self.ui.sync_status_label.setText("Aguardando parceiro...")
+        else:
+            self.current_room = None
+            self.ui.connect_button.setEnabled(True)
+            error = (room_data or {}).get('error', 'Desconhecido')
+            self.ui.sync_status_label.setText(f"Erro: {error}")
 
+    def handle_join_error(self, room_name):
+        if self.current_room != room_name or self.synced_session_active: return
+        self.current_room = None
+        self.ui.connect_button.setEnabled(True)
+        self.ui.sync_status_label.setText("Erro de conexão.")
 
     def disconnect_from_synced_session(self):
-        # In a real app, you'd notify the server you are leaving.
-        # For this prototype, we just stop polling.
-        self.sync_timer.stop()
+        # Tell the server we are leaving so the room can be freed right away;
+        # if this fails, the server expires us after USER_TTL anyway.
+        if self.current_room:
+            payload = {"room_name": self.current_room, "user_id": self.user_id}
+            run_in_background(api_client.post, f"{SYNC_SERVER}/leave_room", json=payload, timeout=5)
+        self.stop_synced_session()
+
+    def stop_synced_session(self):
+        """Only tears down the local sync state; does not talk to the server."""
+        self.stop_room_watcher()
         self.synced_session_active = False
         self.current_room = None
         self.ui.connect_button.setEnabled(True)
@@ -328,39 +448,52 @@ class BlockerApp(QMainWindow):
         if remaining_seconds > 0:
             self.total_seconds = synced_duration
             self.end_time = QDateTime.currentDateTime().addSecs(int(remaining_seconds))
-            self.timer.start(16)
+            self.timer.start(0)
+            self.begin_session_record(started_at)
             
             # Update UI state
             self.ui.sync_status_label.setText("Sessão em andamento!")
             self.ui.start_button.setEnabled(False)
             self.ui.circular_timer.set_inputs_visible(False)
 
-    def poll_server_status(self):
+    def start_room_watcher(self):
+        self.stop_room_watcher()
+        self.room_watcher = RoomWatcher(self.current_room, self.user_id, self)
+        self.room_watcher.room_updated.connect(self.handle_room_update)
+        self.room_watcher.connection_lost.connect(self.handle_room_connection_lost)
+        self.room_watcher.start()
+
+    def stop_room_watcher(self):
+        if self.room_watcher is not None:
+            self.room_watcher.stop()
+            self.room_watcher.room_updated.disconnect()
+            self.room_watcher.connection_lost.disconnect()
+            self.room_watcher = None
+
+    def handle_room_update(self, room_data):
         if not self.synced_session_active or not self.current_room: return
-        try:
-            response = requests.get(f"{SERVER_BASE_URL}/room_status", params={"room_name": self.current_room})
-            if response.status_code == 200:
-                room_data = response.json()
-                
-                # --- THIS IS THE KEY LOGIC FOR THE WAITING USER ---
-                # If the server says the room is running, but our timer isn't, start it.
-                if room_data.get("status") == "running" and not self.timer.isActive():
-                    self.sync_and_start_local_timer(room_data)
-
-                elif room_data.get("status") == "cancelled" and room_data.get("cancelled_by") != self.user_id:
-                    self.ui.sync_status_label.setText("Sessão cancelada pelo parceiro!")
-                    self.reset_timer()
-                    self.disconnect_from_synced_session()
-                # ... (other status updates)
-            else:
-                self.disconnect_from_synced_session()
-        except requests.RequestException:
-            self.ui.sync_status_label.setText("Conexão perdida.")
+
+        # --- THIS IS THE KEY LOGIC FOR THE WAITING USER ---
+        # If the server says the room is running, but our timer isn't, start it.
+        if room_data.get("status") == "running" and not self.timer.isActive():
+            self.sync_and_start_local_timer(room_data)
+
+        elif room_data.get("status") == "cancelled" and room_data.get("cancelled_by") != self.user_id:
+            self.ui.sync_status_label.setText("Sessão cancelada pelo parceiro!")
+            self.reset_timer()
             self.disconnect_from_synced_session()
+        # ... (other status updates)
+
+    def handle_room_connection_lost(self):
+        if not self.synced_session_active: return
+        self.disconnect_from_synced_session()
+        self.ui.sync_status_label.setText("Conexão perdida.")
 
     def cleanup_all_blocks(self):
         print(">>> Iniciando limpeza de todas as regras de bloqueio...")
         self.update_hosts_file([], is_enabled=False, is_cleanup=True)
+        if self.resolver_process is not None:
+            self.update_dns_resolver([], is_enabled=False, is_cleanup=True)
         if platform.system() == "Windows":
             for exe in list(self.previously_blocked_exes):
                 self.unblock_executable(exe)
@@ -368,6 +501,12 @@ class BlockerApp(QMainWindow):
 
     def closeEvent(self, event):
         self.cleanup_all_blocks()
+        self.stop_dns_resolver()
+        # Fechar no meio da sessão é como cancelar (reset_timer): não conta tempo.
+        # Só uma sessão interrompida por crash é recuperada pelo replay() do diário
+        self.abort_session_record()
+        self.journal.close()
+        self.history_store.close()
         event.accept()
 
     # main.py -> inside BlockerApp class
@@ -436,13 +575,26 @@ class BlockerApp(QMainWindow):
         # --- SINAIS PARA AS LISTAS ---
         self.ui.add_url_button.clicked.connect(self.add_url_from_input)
         self.ui.remove_url_button.clicked.connect(self.remove_selected_url)
+        self.ui.import_urls_button.clicked.connect(self.import_blocklist_from_file)
         self.ui.url_input.returnPressed.connect(self.add_url_from_input)
+        self.ui.url_filter_input.textChanged.connect(self.ui.website_list_model.set_filter)
         
         self.ui.add_app_button.clicked.connect(self.add_app_from_input)
         self.ui.remove_app_button.clicked.connect(self.remove_selected_app)
         self.ui.app_input.returnPressed.connect(self.add_app_from_input)
 
         self.ui.apply_button.clicked.connect(self.apply_all_changes)
+
+        # --- SINAIS DO HISTÓRICO ---
+        self.ui.history_older_button.clicked.connect(self.ui.history_graph.page_older)
+        self.ui.history_newer_button.clicked.connect(self.ui.history_graph.page_newer)
+        self.ui.history_zoom_combo.currentIndexChanged.connect(
+            lambda index: self.ui.history_graph.set_zoom(self.ui.history_zoom_combo.itemData(index))
+        )
+        self.ui.history_graph.page_changed.connect(self.update_history_controls)
+
+        self.ui.ranking_period_combo.currentIndexChanged.connect(lambda _: self.update_ranking_display())
+
         self.ui.start_button.clicked.connect(self.start_timer)
         self.ui.reset_button.clicked.connect(self.reset_timer)
 
@@ -469,16 +621,12 @@ class BlockerApp(QMainWindow):
                 "user_id": self.user_id,
                 "duration_seconds": self.total_seconds
             }
-            try:
-                # The server response will tell us if the session starts now
-                response = requests.post(f"{SERVER_BASE_URL}/start_timer", json=payload)
-                if response.status_code == 200:
-                    room_data = response.json()
-                    # If our click was the one that started the session, sync immediately
-                    if room_data.get("status") == "running" and not self.timer.isActive():
-                        self.sync_and_start_local_timer(room_data)
-            except requests.RequestException:
-                self.ui.sync_status_label.setText("Erro ao iniciar timer no servidor.")
+            # The server response will tell us if the session starts now
+            run_in_background(
+                request_json, "POST", f"{SYNC_SERVER}/start_timer", json=payload,
+                on_success=lambda result: self.handle_start_timer_response(*result),
+                on_error=lambda error: self.ui.sync_status_label.setText("Erro ao iniciar timer no servidor.")
+            )
         else:
             # Standalone timer logic (unchanged)
 
@@ -491,17 +639,20 @@ class BlockerApp(QMainWindow):
                 self.ui.apply_button.setEnabled(False)
 
                 self.end_time = QDateTime.currentDateTime().addSecs(self.total_seconds)
-                self.timer.start(16); self.ui.start_button.setEnabled(False); self.ui.circular_timer.set_inputs_visible(False)
+                self.timer.start(0); self.ui.start_button.setEnabled(False); self.ui.circular_timer.set_inputs_visible(False)
+                self.begin_session_record()
+
+    def handle_start_timer_response(self, status_code, room_data):
+        if status_code != 200 or not room_data or not self.synced_session_active: return
+        # If our click was the one that started the session, sync immediately
+        if room_data.get("status") == "running" and not self.timer.isActive():
+            self.sync_and_start_local_timer(room_data)
 
     def update_countdown(self):
         now = QDateTime.currentDateTime()
         remaining_msecs = now.msecsTo(self.end_time)
         if remaining_msecs <= 0:
-            # --- ATUALIZADO: Envia o tempo para o servidor ---
-            self.send_block_time_to_server(self.total_seconds)
-            
-            updated_data = self.save_session_history(self.total_seconds)
-            self.ui.history_graph.load_history(updated_data)
+            self.finish_session_record()
             self.timer.stop()
             self.ui.status_label.setText("Status: Timer finalizado!")
             QApplication.beep()
@@ -509,10 +660,37 @@ class BlockerApp(QMainWindow):
             return
         current_seconds_float = remaining_msecs / 1000.0
         self.ui.circular_timer.set_time(self.total_seconds, current_seconds_float)
+        self.schedule_next_tick(remaining_msecs)
+
+    def schedule_next_tick(self, remaining_msecs):
+        """
+        Wakes up only when something visible changes: the next second boundary
+        (text) or the arc advancing one pixel, whichever comes first. While the
+        window is minimised or hidden, sleeps straight until the session ends.
+        """
+        if self.isMinimized() or not self.isVisible():
+            delay = remaining_msecs
+        else:
+            until_next_second = remaining_msecs % 1000 or 1000
+            per_pixel = self.ui.circular_timer.msecs_per_arc_pixel(self.total_seconds)
+            delay = min(until_next_second, max(MIN_TICK_MS, per_pixel))
+        self.timer.start(max(1, int(delay)))
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        # Back from minimised: refresh right away instead of waiting for the end
+        if event.type() == QEvent.Type.WindowStateChange and self.timer.isActive() and not self.isMinimized():
+            self.timer.start(0)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.timer.isActive():
+            self.timer.start(0)
 
     def reset_timer(self):
         """Stops and resets the timer, and DEACTIVATES blocking."""
         self.timer.stop()
+        self.abort_session_record()
         
         # Disable blocking and apply the changes
         self.ui.enable_checkbox.setChecked(False)
@@ -532,11 +710,17 @@ class BlockerApp(QMainWindow):
     
         if self.synced_session_active and self.current_room: #and self.timer.isActive():
             payload = {"room_name": self.current_room, "user_id": self.user_id}
-            try:
-                requests.post(f"{SERVER_BASE_URL}/cancel_timer", json=payload)
-            except requests.RequestException:
-                self.ui.sync_status_label.setText("Erro ao cancelar no servidor.")
-            self.disconnect_from_synced_session()
+
+            def cancel_and_leave():
+                # Sequential on purpose: the partner must see the cancel before we leave
+                api_client.post(f"{SYNC_SERVER}/cancel_timer", json=payload)
+                api_client.post(f"{SYNC_SERVER}/leave_room", json=payload, timeout=5)
+
+            run_in_background(
+                cancel_and_leave,
+                on_error=lambda error: self.ui.sync_status_label.setText("Erro ao cancelar no servidor.")
+            )
+            self.stop_synced_session()
 
     def change_tab(self, index):
         self.ui.tabs.setCurrentIndex(index)
@@ -546,30 +730,29 @@ class BlockerApp(QMainWindow):
             
     def apply_all_changes(self):
         is_enabled = self.ui.enable_checkbox.isChecked()
-        website_list = [self.ui.website_list_widget.item(i).text() for i in range(self.ui.website_list_widget.count())]
-        self.update_hosts_file(website_list, is_enabled)
+        website_list = self.ui.website_list_model.items()
+        if self.resolver_process is not None:
+            self.update_dns_resolver(website_list, is_enabled)
+        else:
+            self.update_hosts_file(website_list, is_enabled)
         
         if platform.system() == "Windows":
-            app_list = [self.ui.app_list_widget.item(i).text() for i in range(self.ui.app_list_widget.count())]
+            app_list = self.ui.app_list_model.items()
             self.update_exe_blocks(app_list, is_enabled)
 
     def load_initial_state(self):
         self.cleanup_all_blocks()
         self.ui.status_label.setText("Status: Pronto para iniciar.")
-        self.ui.website_list_widget.clear()
+        self.ui.website_list_model.clear()
         
         if platform.system() == "Windows":
-            self.ui.app_list_widget.clear()
+            self.ui.app_list_model.clear()
             self.load_exe_block_state()
 
-        app_data_path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
-        history_file = os.path.join(app_data_path, "blocker_history.json")
-        try:
-            with open(history_file, 'r') as f:
-                history_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            history_data = {}
-        self.ui.history_graph.load_history(history_data)
+        self.recover_journal()
+        self.ui.history_graph.set_source(self.history_store.totals, self.history_store.first_day())
+        # Tenta enviar sessões que ficaram pendentes da última execução
+        self.flush_outbox()
 
     def get_config_path(self, filename):
         app_data_path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
@@ -578,11 +761,11 @@ class BlockerApp(QMainWindow):
     def save_lists_to_files(self):
         try:
             websites_path = self.get_config_path(WEBSITE_CONFIG_FILE)
-            website_list = [self.ui.website_list_widget.item(i).text() for i in range(self.ui.website_list_widget.count())]
+            website_list = self.ui.website_list_model.items()
             with open(websites_path, 'w') as f: json.dump(website_list, f)
             if platform.system() == "Windows":
                 apps_path = self.get_config_path(APP_CONFIG_FILE)
-                with open(apps_path, 'w') as f: f.write(self.ui.app_list_edit.toPlainText())
+                with open(apps_path, 'w') as f: f.write('\n'.join(self.ui.app_list_model.items()))
             print(">>> Listas de bloqueio salvas.")
         except Exception as e: print(f"Erro ao salvar listas: {e}")
     def load_lists_from_files(self):
@@ -590,100 +773,165 @@ class BlockerApp(QMainWindow):
             websites_path = self.get_config_path(WEBSITE_CONFIG_FILE)
             if os.path.exists(websites_path):
                 with open(websites_path, 'r') as f:
-                    website_list = json.load(f)
-                    self.ui.website_list_widget.clear(); self.ui.website_list_widget.addItems(website_list)
+                    website_list = [entry for entry in map(normalize_domain, json.load(f)) if entry]
+                    self.ui.website_list_model.clear(); self.ui.website_list_model.add_items(website_list)
             if platform.system() == "Windows":
                 apps_path = self.get_config_path(APP_CONFIG_FILE)
                 if os.path.exists(apps_path):
-                    with open(apps_path, 'r') as f: self.ui.app_list_edit.setText(f.read())
+                    with open(apps_path, 'r') as f:
+                        self.ui.app_list_model.clear(); self.ui.app_list_model.add_items(line.strip() for line in f)
             print(">>> Listas de bloqueio carregadas.")
         except Exception as e: print(f"Erro ao carregar listas: {e}")
     
-    def save_session_history(self, session_duration_seconds):
-        app_data_path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
-        history_file = os.path.join(app_data_path, "blocker_history.json")
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        try:
-            with open(history_file, 'r') as f:
-                data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = {}
-        data[today_str] = data.get(today_str, 0) + session_duration_seconds
-        os.makedirs(app_data_path, exist_ok=True)
-        with open(history_file, 'w') as f:
-            json.dump(data, f)
-        return data
-
-# Em main.py, substitua toda a sua função update_hosts_file por esta:
+    def update_history_controls(self):
+        graph = self.ui.history_graph
+        self.ui.history_page_label.setText(graph.page_title())
+        self.ui.history_older_button.setEnabled(graph.can_page_older())
+        self.ui.history_newer_button.setEnabled(graph.can_page_newer())
+
+    def save_session_history(self, event):
+        """Grava uma sessão encerrada do diário no histórico local (sessão + totais por dia, semana e mês)."""
+        self.history_store.record_session(
+            event['id'], event['started_at'], event['ended_at'], event['seconds'], room=event.get('room')
+        )
 
     def update_hosts_file(self, blacklist, is_enabled, is_cleanup=False):
         """
-        Atualiza o arquivo hosts. Pega cada domínio da blacklist e expande
-        para as versões com e sem 'www.' antes de escrever.
+        Atualiza o arquivo hosts através do HostsManager, que só reescreve o
+        arquivo (de forma atômica) quando o bloco gerenciado realmente muda.
         """
         try:
-            with open(self.hosts_path, 'r') as f:
-                lines = [line for line in f if MARKER not in line]
-            
-            if is_enabled:
-                # Cria um conjunto final para evitar duplicatas e guardar as variações
-                final_blacklist = set()
-                
-                # Para cada domínio limpo da lista, gera as duas variações
-                for canonical_domain in blacklist:
-                    domain_stripped = canonical_domain.strip()
-                    if domain_stripped:
-                        final_blacklist.add(domain_stripped)           # Adiciona -> google.com
-                        final_blacklist.add('www.' + domain_stripped)  # Adiciona -> www.google.com
-
-                # Escreve a lista final e expandida no arquivo hosts
-                for site in sorted(list(final_blacklist)):
-                    lines.append(f"{REDIRECT_IP}\t{site}\t{MARKER}\n")
-            
-            with open(self.hosts_path, 'w') as f:
-                f.writelines(lines)
+            changed = self.hosts_manager.apply(blacklist, is_enabled)
             
             if not is_cleanup and (is_enabled and blacklist):
                 self.ui.status_label.setText("Status: Lista de bloqueio atualizada!")
                 self.ui.status_label.setStyleSheet("color: green;")
-                self.flush_dns()
+                if changed:
+                    self.flush_dns()
         except Exception as e:
             self.ui.status_label.setText(f"Hosts Error: {e}. Execute como Admin.")
             self.ui.status_label.setStyleSheet("color: red;")
 
+    def start_dns_resolver(self):
+        """Sobe dns_blocker.py como subprocesso; o DNS do sistema deve apontar para RESOLVER_LISTEN."""
+        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dns_blocker.py')
+        control = f"{RESOLVER_CONTROL[0]}:{RESOLVER_CONTROL[1]}"
+        try:
+            self.resolver_process = subprocess.Popen([
+                sys.executable, script_path,
+                "--listen", RESOLVER_LISTEN, "--upstream", RESOLVER_UPSTREAM, "--control", control
+            ])
+            atexit.register(self.stop_dns_resolver)
+            print(f">>> Resolvedor DNS local iniciado em {RESOLVER_LISTEN}.")
+        except OSError as e:
+            print(f"*** ERRO ao iniciar o resolvedor DNS, usando o arquivo hosts: {e}")
+            self.resolver_process = None
+
+    def stop_dns_resolver(self):
+        if self.resolver_process is not None:
+            self.resolver_process.terminate()
+            self.resolver_process = None
+
+    def update_dns_resolver(self, blacklist, is_enabled, is_cleanup=False):
+        """
+        Troca a lista do resolvedor local: nenhuma escrita em arquivo, nenhum flush de DNS.
+        O envio (que espera o resolvedor subir) roda em segundo plano; se duas listas forem
+        pedidas em seguida, uma mais antiga nunca sobrescreve a mais nova.
+        """
+        # Desligado, a lista não vai: o resolvedor guarda a última e não precisa remontá-la
+        domains = [d.strip() for d in blacklist if d.strip()] if is_enabled else None
+        self.resolver_generation += 1
+        generation = self.resolver_generation
+
+        def send():
+            with self.resolver_send_lock:
+                if generation < self.resolver_sent_generation:
+                    return False
+                dns_blocker.send_blocklist(RESOLVER_CONTROL, domains, is_enabled)
+                self.resolver_sent_generation = generation
+                return True
+
+        def on_sent(sent):
+            if sent and not is_cleanup and (is_enabled and blacklist):
+                self.ui.status_label.setText("Status: Lista de bloqueio atualizada!")
+                self.ui.status_label.setStyleSheet("color: green;")
+
+        def on_error(e):
+            self.ui.status_label.setText(f"Resolver Error: {e}")
+            self.ui.status_label.setStyleSheet("color: red;")
+
+        run_in_background(send, on_success=on_sent, on_error=on_error)
+
     def add_url_from_input(self):
-        """Adiciona uma URL da caixa de texto à lista de sites."""
-        url = self.ui.url_input.text().strip()
-        if url:
-            # Evita adicionar itens duplicados
-            items = self.ui.website_list_widget.findItems(url, Qt.MatchFlag.MatchExactly)
-            if not items:
-                self.ui.website_list_widget.addItem(url)
-            self.ui.url_input.clear()
+        """Adiciona uma URL da caixa de texto à lista de sites, já normalizada para o domínio."""
+        text = self.ui.url_input.text().strip()
+        if not text:
+            return
+        entry = normalize_domain(text)
+        if entry is None:
+            self.ui.status_label.setText(f"Status: '{text}' não é um domínio válido.")
+            self.ui.status_label.setStyleSheet("color: red;")
+            return
+        # O modelo ignora itens duplicados (checagem em O(1) no set)
+        self.ui.website_list_model.add_items([entry])
+        self.ui.url_input.clear()
 
     def remove_selected_url(self):
-        """Remove o item selecionado da lista de sites."""
-        list_items = self.ui.website_list_widget.selectedItems()
-        if not list_items: return
-        for item in list_items:
-            self.ui.website_list_widget.takeItem(self.ui.website_list_widget.row(item))
+        """Remove os itens selecionados da lista de sites."""
+        self.remove_selected_rows(self.ui.website_list_view)
+
+    def remove_selected_rows(self, view):
+        """Remove em lote as linhas selecionadas de uma view de BlockListModel."""
+        model = view.model()
+        selected = [model.item_at(index.row()) for index in view.selectionModel().selectedRows()]
+        if selected:
+            model.remove_items(selected)
+
+    def import_blocklist_from_file(self):
+        """Importa uma lista da comunidade (hosts, domínios ou Adblock) lendo o arquivo em segundo plano."""
+        path, _ = QFileDialog.getOpenFileName(self, "Importar lista de bloqueio", "", "Listas (*.txt *.hosts *.list);;Todos os arquivos (*)")
+        if not path:
+            return
+        self.ui.import_urls_button.setEnabled(False)
+        self.ui.status_label.setText("Status: Importando lista...")
+        self.ui.status_label.setStyleSheet("")
+        run_in_background(
+            load_blocklist_file, path, self.ui.website_list_model,
+            on_success=self.handle_blocklist_imported,
+            on_error=self.handle_blocklist_import_error
+        )
+
+    def handle_blocklist_imported(self, entries, start=0, added_count=0):
+        """
+        Junta as entradas lidas à lista em blocos de IMPORT_CHUNK_SIZE, devolvendo o
+        controle ao loop de eventos entre eles para a interface não travar em listas grandes.
+        """
+        chunk = entries[start:start + IMPORT_CHUNK_SIZE]
+        # A lista pode ter mudado durante a leitura; add_items descarta o que já entrou
+        added_count += len(self.ui.website_list_model.add_items(chunk))
+        if start + IMPORT_CHUNK_SIZE < len(entries):
+            QTimer.singleShot(0, lambda: self.handle_blocklist_imported(entries, start + IMPORT_CHUNK_SIZE, added_count))
+            return
+        self.ui.import_urls_button.setEnabled(True)
+        self.ui.status_label.setText(f"Status: {added_count} domínios importados.")
+        self.ui.status_label.setStyleSheet("color: green;")
+
+    def handle_blocklist_import_error(self, error):
+        self.ui.import_urls_button.setEnabled(True)
+        self.ui.status_label.setText(f"Erro ao importar lista: {error}")
+        self.ui.status_label.setStyleSheet("color: red;")
 
     def add_app_from_input(self):
         """Adiciona um .exe da caixa de texto à lista de apps."""
         app = self.ui.app_input.text().strip()
         if app:
-            # Evita adicionar itens duplicados
-            items = self.ui.app_list_widget.findItems(app, Qt.MatchFlag.MatchExactly)
-            if not items:
-                self.ui.app_list_widget.addItem(app)
+            # O modelo ignora itens duplicados
+            self.ui.app_list_model.add_items([app])
             self.ui.app_input.clear()
 
     def remove_selected_app(self):
-        """Remove o item selecionado da lista de apps."""
-        list_items = self.ui.app_list_widget.selectedItems()
-        if not list_items: return
-        for item in list_items:
-            self.ui.app_list_widget.takeItem(self.ui.app_list_widget.row(item))
+        """Remove os itens selecionados da lista de apps."""
+        self.remove_selected_rows(self.ui.app_list_view)
 
     def update_exe_blocks(self, blacklist, is_enabled):
         try:
@@ -698,7 +946,7 @@ class BlockerApp(QMainWindow):
                 for exe in self.previously_blocked_exes: self.unblock_executable(exe)
             self.previously_blocked_exes = to_block if is_enabled else set()
             
-            if not self.ui.website_list_widget.count() > 0:
+            if not len(self.ui.website_list_model) > 0:
                  self.ui.status_label.setText("Status: Lista de bloqueio atualizada!")
                  self.ui.status_label.setStyleSheet("color: green;")
         except Exception as e:
@@ -720,7 +968,7 @@ class BlockerApp(QMainWindow):
                         i += 1
                     except OSError: break
             
-            self.ui.app_list_widget.addItems(sorted(list(blocked_exes)))
+            self.ui.app_list_model.add_items(sorted(blocked_exes))
             self.previously_blocked_exes = blocked_exes
         except FileNotFoundError: pass
         except Exception as e: print(f"Could not load EXE state: {e}")
@@ -768,69 +1016,188 @@ class BlockerApp(QMainWindow):
         """Finaliza o arraste da janela ao soltar o mouse."""
         self.old_pos = None
 
-    def send_block_time_to_server(self, duration_seconds):
-        if not hasattr(self, 'logged_in_user') or not self.logged_in_user:
-            print("*** AVISO: Usuário não logado. O tempo não será enviado.")
+    def begin_session_record(self, started_at=None):
+        """Abre a sessão no diário local assim que o timer começa a contar."""
+        self.current_session_id = str(uuid.uuid4())
+        self.session_started_at = started_at or time.time()
+        room = self.current_room if self.synced_session_active else None
+        self.journal.start(self.current_session_id, self.logged_in_user, self.total_seconds, room, self.session_started_at)
+        self.checkpoint_timer.start()
+
+    def write_checkpoint(self):
+        if self.current_session_id is not None:
+            self.journal.checkpoint(self.current_session_id, time.time() - self.session_started_at)
+
+    def finish_session_record(self):
+        """Fecha a sessão no diário, grava no histórico e a coloca na fila de envio."""
+        self.checkpoint_timer.stop()
+        if self.current_session_id is None:
             return
-        server_url = f"{SERVER_BASE_URL}/add_time"
-        payload = {'username': self.logged_in_user, 'seconds': duration_seconds}
+        room = self.current_room if self.synced_session_active else None
+        event = self.journal.end(
+            self.current_session_id, self.logged_in_user, self.session_started_at, time.time(), self.total_seconds, room
+        )
+        self.current_session_id = None
+        self.save_session_history(event)
+        self.ui.history_graph.refresh()
+        # Não envia na hora: espera OUTBOX_FLUSH_DELAY_MS para juntar as sessões seguintes no mesmo
+        # lote (o diário já guarda a sessão; se o app fechar antes, ela vai na próxima execução).
+        # Com uma nova tentativa já agendada, ela leva esta sessão junto
+        if not (self.outbox_flush_timer.isActive() or self.upload_retry_timer.isActive()):
+            self.outbox_flush_timer.start()
+
+    def abort_session_record(self):
+        """Sessão cancelada antes do fim: não conta tempo, como antes do diário."""
+        self.checkpoint_timer.stop()
+        if self.current_session_id is not None:
+            self.journal.abort(self.current_session_id)
+            self.current_session_id = None
+
+    def recover_journal(self):
+        """
+        Na inicialização: sessões interrompidas por um crash entram no histórico com o
+        tempo do último checkpoint, e a caixa de saída antiga (JSON) passa para o diário.
+        """
+        recovered = self.journal.replay()
+        for event in recovered:
+            self.save_session_history(event)
+        if recovered:
+            minutes = sum(event['seconds'] for event in recovered) // 60
+            print(f">>> {len(recovered)} sessões interrompidas recuperadas ({minutes} min).")
+
+        legacy_path = self.get_config_path(LEGACY_OUTBOX_FILE)
         try:
-            requests.post(server_url, json=payload, timeout=10)
-            print(f">>> Tempo de bloqueio ({duration_seconds}s) enviado para o servidor para o usuário {self.logged_in_user}.")
-        except requests.exceptions.RequestException as e:
-            print(f"*** ERRO ao enviar tempo para o servidor: {e}")
+            with open(legacy_path, 'r') as f:
+                legacy_outbox = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        now = time.time()
+        for record in legacy_outbox:
+            # Já contadas no histórico local quando terminaram; aqui só falta o envio
+            self.journal.end(record['session_id'], record['username'], now, now, record['seconds'])
+        os.remove(legacy_path)
+
+    def flush_outbox(self):
+        """Envia as sessões pendentes do diário em uma única requisição para /add_time/batch."""
+        if self.outbox_flush_in_progress:
+            return
+        # O servidor credita o lote ao usuário do token: só vão as sessões deste usuário
+        pending = [event for event in self.journal.pending() if event['user'] == self.logged_in_user][:OUTBOX_BATCH_SIZE]
+        if not pending:
+            return
+        self.outbox_flush_in_progress = True
+        self.upload_retry_timer.stop()
+        self.outbox_flush_timer.stop()
+        # 'day' é o dia local em que a sessão terminou, para o servidor somá-la ao dia certo mesmo com envio atrasado
+        sessions = [
+            {'username': event['user'], 'seconds': event['seconds'], 'session_id': event['id'],
+             'day': HistoryStore.day_for(event['ended_at'])}
+            for event in pending
+        ]
+        server_url = f"{SERVER_BASE_URL}/add_time/batch"
+        run_in_background(
+            request_json, "POST", server_url, json={'sessions': sessions}, idempotent=True,
+            on_success=lambda result: self.handle_outbox_response(*result),
+            on_error=self.handle_outbox_error
+        )
+
+    def handle_outbox_response(self, status_code, result):
+        self.outbox_flush_in_progress = False
+        if status_code == 401:
+            # Token ausente ou expirado: as sessões ficam no diário até o próximo login
+            print("*** Sessão de login expirada; o envio do tempo fica para o próximo login.")
+            self.ui.status_label.setText("Status: Login expirado. Entre novamente para enviar seu tempo.")
+            return
+        if status_code != 200 or not result:
+            print(f"*** ERRO ao enviar sessões pendentes: {status_code}")
+            self.schedule_outbox_retry()
+            return
+
+        # Aplicadas e duplicadas já estão no servidor; usuário desconhecido nunca será aceito
+        stored = set(result.get('applied', [])) | set(result.get('duplicates', []))
+        done = stored | set(result.get('unknown_user', []))
+        self.journal.ack(done)
+        self.history_store.mark_synced(stored)
+        remaining = sum(1 for event in self.journal.pending() if event['user'] == self.logged_in_user)
+        print(f">>> {len(done)} sessões enviadas para o servidor; {remaining} pendentes.")
+        self.upload_retry_ms = UPLOAD_RETRY_MIN_MS
+        if remaining and done:
+            self.flush_outbox() # Próximo lote
+
+    def handle_outbox_error(self, error):
+        self.outbox_flush_in_progress = False
+        print(f"*** ERRO ao enviar tempo para o servidor (ficará pendente): {error}")
+        self.schedule_outbox_retry()
+
+    def schedule_outbox_retry(self):
+        """Tenta de novo mais tarde, dobrando a espera a cada falha seguida."""
+        self.upload_retry_timer.start(self.upload_retry_ms)
+        self.upload_retry_ms = min(self.upload_retry_ms * 2, UPLOAD_RETRY_MAX_MS)
 
     def update_ranking_display(self):
         print(">>> Buscando dados do ranking...")
         self.ui.status_label.setText("Status: Carregando ranking...")
-        QApplication.processEvents()
 
+        period = self.ui.ranking_period_combo.currentData()
+        # Se a tabela já mostra este período, manda o ETag: sem mudanças o servidor responde 304
+        etag = self.ranking_etag[1] if self.ranking_etag and self.ranking_etag[0] == period else None
         server_url = f"{SERVER_BASE_URL}/ranking"
-        try:
-            response = requests.get(server_url, timeout=10)
-            if response.status_code == 200:
-                ranking_data = response.json()
-                self.ui.ranking_table_widget.setRowCount(len(ranking_data))
-                self.ui.ranking_table_widget.setColumnCount(3)
-                self.ui.ranking_table_widget.setHorizontalHeaderLabels(["Rank", "Usuário", "Tempo Total"])
-
-                for row, user_data in enumerate(ranking_data):
-                    total_seconds = user_data.get('total_seconds', 0)
-                    hours, remainder = divmod(total_seconds, 3600)
-                    minutes, seconds = divmod(remainder, 60)
-                    time_str = f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
-
-                    self.ui.ranking_table_widget.setItem(row, 0, QTableWidgetItem(str(user_data.get('rank'))))
-                    self.ui.ranking_table_widget.setItem(row, 1, QTableWidgetItem(user_data.get('username')))
-                    self.ui.ranking_table_widget.setItem(row, 2, QTableWidgetItem(time_str))
-                
-                self.ui.ranking_table_widget.resizeColumnsToContents()
-                self.ui.status_label.setText("Status: Ranking atualizado.")
-            else:
-                self.ui.status_label.setText(f"Status: Erro ao carregar ranking ({response.status_code})")
-        except requests.exceptions.RequestException as e:
-            self.ui.status_label.setText("Status: Erro de conexão ao buscar ranking.")
-            print(f"*** ERRO ao buscar ranking: {e}")
+        run_in_background(
+            request_json_if_changed, "GET", server_url, etag=etag, params={'period': period},
+            on_success=lambda result: self.handle_ranking_response(period, *result),
+            on_error=self.handle_ranking_error
+        )
+
+    def handle_ranking_response(self, period, status_code, ranking_data, etag):
+        if period != self.ui.ranking_period_combo.currentData():
+            return # Resposta de um período que o usuário já trocou
+        if status_code == 304:
+            self.ui.status_label.setText("Status: Ranking atualizado.")
+            return
+        if status_code != 200 or ranking_data is None:
+            self.ui.status_label.setText(f"Status: Erro ao carregar ranking ({status_code})")
+            return
+
+        self.ui.ranking_table_widget.setRowCount(len(ranking_data))
+        self.ui.ranking_table_widget.setColumnCount(3)
+        self.ui.ranking_table_widget.setHorizontalHeaderLabels(["Rank", "Usuário", "Tempo Total"])
+
+        for row, user_data in enumerate(ranking_data):
+            total_seconds = user_data.get('total_seconds', 0)
+            hours, remainder = divmod(total_seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            time_str = f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
+
+            self.ui.ranking_table_widget.setItem(row, 0, QTableWidgetItem(str(user_data.get('rank'))))
+            self.ui.ranking_table_widget.setItem(row, 1, QTableWidgetItem(user_data.get('username')))
+            self.ui.ranking_table_widget.setItem(row, 2, QTableWidgetItem(time_str))
+
+        self.ui.ranking_table_widget.resizeColumnsToContents()
+        self.ranking_etag = (period, etag)
+        self.ui.status_label.setText("Status: Ranking atualizado.")
+
+    def handle_ranking_error(self, error):
+        self.ui.status_label.setText("Status: Erro de conexão ao buscar ranking.")
+        print(f"*** ERRO ao buscar ranking: {error}")
 
 
 
 # --- PONTO DE ENTRADA DA APLICAÇÃO ---
 if __name__ == '__main__':
+    # Permite importar o QtWebEngine só quando necessário (fallback em hourglass_view.py)
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     app.setStyleSheet(DARK_THEME_MODERN)
 
-    #login_dialog = LoginDialog()
-    
-    #if login_dialog.exec() == QDialog.DialogCode.Accepted:
-        # Pass the username from the dialog to the main app
-        #main_app = BlockerApp(login_dialog.successful_username)
-        
+    login_dialog = LoginDialog()
+
+    if login_dialog.exec() == QDialog.DialogCode.Accepted:
+        # O token do login autentica /ranking e /add_time; sem ele o servidor responde 401
+        main_app = BlockerApp(login_dialog.successful_username, login_dialog.successful_token)
+
         # Register cleanup function to be called on exit
-        #atexit.register(main_app.cleanup_all_blocks)
-        
-        #main_app.show()
-        #sys.exit(app.exec())
-    #else:
-        # If login is canceled or fails, the program exits
-    BlockerApp("nomequalquer").show()
-    sys.exit(app.exec())
\ No newline at end of file
+        atexit.register(main_app.cleanup_all_blocks)
+
+        main_app.show()
+        sys.exit(app.exec())
+    # If login is canceled or fails, the program exits
@@ -0,0 +1,187 @@
+# network.py
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class NetworkTaskSignals(QObject):
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+class NetworkTask(QRunnable):
+    """
+    Executa uma chamada bloqueante (ex.: requests.post) em uma thread do pool.
+    O resultado, ou a exceção, volta para a thread da interface via sinais.
+    """
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = NetworkTaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.succeeded.emit(result)
+
+# Mantém referências às tarefas em andamento até o sinal ser entregue
+_pending_tasks = set()
+
+def run_in_background(fn, *args, on_success=None, on_error=None, **kwargs):
+    """
+    Agenda `fn(*args, **kwargs)` no QThreadPool global sem bloquear a interface.
+    `on_success(resultado)` e `on_error(exceção)` rodam na thread da interface.
+    """
+    task = NetworkTask(fn, *args, **kwargs)
+    task.setAutoDelete(False)
+    _pending_tasks.add(task)
+
+    def finish(callback, value):
+        _pending_tasks.discard(task)
+        if callback is not None:
+            callback(value)
+
+    task.signals.succeeded.connect(lambda result: finish(on_success, result))
+    task.signals.failed.connect(lambda error: finish(on_error, error))
+    QThreadPool.globalInstance().start(task)
+    return task
+
+DEFAULT_TIMEOUT = 10      # Segundos, usado quando a chamada não define o próprio timeout
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5        # Espera antes da 1ª nova tentativa; dobra a cada tentativa
+BACKOFF_MAX = 8
+RETRY_STATUS = {502, 503, 504}
+POOL_MAXSIZE = 8          # Conexões mantidas abertas por host
+
+class ApiClient:
+    """
+    Sessão HTTP única para todo o cliente: conexões keep-alive reaproveitadas
+    por host, timeout padrão, novas tentativas com backoff exponencial com
+    jitter e contadores de tempo por endpoint.
+
+    Chamadas marcadas como `idempotent` (GET por padrão) são repetidas em
+    qualquer erro de conexão ou timeout e em 502/503/504. As outras só em
+    502/503/504 e quando a conexão nem chegou a ser aberta (timeout ou recusa
+    ao conectar, falha de DNS): um ConnectionError também pode vir de uma
+    conexão derrubada depois de o corpo ter sido enviado ("Connection
+    aborted"), e repetir aí poderia aplicar a mesma ação duas vezes.
+    """
+    def __init__(self, max_retries=MAX_RETRIES, pool_maxsize=POOL_MAXSIZE):
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        self._auth = None # (URL base, token): o token só vai para esse servidor
+
+    def set_auth_token(self, base_url, token):
+        """Envia 'Authorization: Bearer <token>' nas requisições para base_url (None remove)."""
+        self._auth = (base_url.rstrip("/") + "/", token) if token else None
+
+    def request(self, method, url, timeout=DEFAULT_TIMEOUT, idempotent=None, retries=None, **kwargs):
+        if idempotent is None:
+            idempotent = method.upper() == "GET"
+        if self._auth and url.startswith(self._auth[0]):
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, Authorization=f"Bearer {self._auth[1]}")
+        retries = self.max_retries if retries is None else retries
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._record(method, url, time.perf_counter() - started, error=True)
+                if not (idempotent or _never_connected(e)) or attempt >= retries:
+                    raise
+            else:
+                self._record(method, url, time.perf_counter() - started, error=response.status_code >= 500)
+                if response.status_code not in RETRY_STATUS or attempt >= retries:
+                    return response
+            attempt += 1
+            time.sleep(self._backoff(attempt))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    @staticmethod
+    def _backoff(attempt):
+        # "Full jitter": espera aleatória entre 0 e o teto exponencial
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (attempt - 1))))
+
+    def _record(self, method, url, elapsed, error):
+        parts = urlsplit(url)
+        key = f"{method.upper()} {parts.netloc}{parts.path}"
+        with self._stats_lock:
+            entry = self._stats.setdefault(key, {'count': 0, 'errors': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            entry['count'] += 1
+            entry['errors'] += int(error)
+            entry['total_seconds'] += elapsed
+            entry['max_seconds'] = max(entry['max_seconds'], elapsed)
+
+    def stats(self):
+        """Cópia dos contadores por endpoint, com a média calculada."""
+        with self._stats_lock:
+            return {
+                key: dict(entry, avg_seconds=entry['total_seconds'] / entry['count'])
+                for key, entry in self._stats.items()
+            }
+
+def _never_connected(error):
+    """True se a requisição falhou antes de abrir a conexão, ou seja, nada chegou ao servidor."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    # O requests embrulha o erro do urllib3 (MaxRetryError -> NewConnectionError) nos args
+    pending, seen = [error], set()
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, NewConnectionError):
+            return True
+        if isinstance(current, BaseException):
+            pending.extend([current.__cause__, current.__context__, getattr(current, 'reason', None)])
+            pending.extend(arg for arg in current.args if isinstance(arg, BaseException))
+    return False
+
+# Cliente compartilhado por main.py e gui.py
+api_client = ApiClient()
+
+def request_json(method, url, **kwargs):
+    """Faz a requisição e decodifica o JSON ainda na thread do pool. Retorna (status, dados)."""
+    response = api_client.request(method, url, **kwargs)
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    return response.status_code, data
+
+def request_json_if_changed(method, url, etag=None, **kwargs):
+    """
+    Como request_json, mas envia If-None-Match com o ETag da última resposta. Num 304
+    o corpo nem é lido. Retorna (status, dados, etag); dados é None no 304.
+    """
+    if etag:
+        kwargs['headers'] = dict(kwargs.get('headers') or {}, **{'If-None-Match': f'"{etag}"'})
+    response = api_client.request(method, url, **kwargs)
+    if response.status_code == 304:
+        return response.status_code, None, etag
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    return response.status_code, data, response.headers.get('ETag', '').removeprefix('W/').strip('"') or None
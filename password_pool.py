@@ -0,0 +1,128 @@
+# password_pool.py
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore, Lock
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+POOL_SIZE = os.cpu_count() or 2
+QUEUE_PER_WORKER = 4 # Pedidos aceitos (em execução + na fila) por processo antes de recusar
+RESULT_TIMEOUT = 30  # Segundos
+
+class PoolBusy(Exception):
+    """A fila de hashing está cheia; o chamador deve responder 503."""
+
+def _timed(fn, *args):
+    # Roda no processo do pool: devolve o resultado e quando/quanto tempo calculou
+    started = time.time()
+    result = fn(*args)
+    return result, started, time.time() - started
+
+class PasswordHasher:
+    """
+    Hash e verificação de senhas num pool de processos limitado.
+
+    O hash é CPU puro e segura o GIL; rodando nas threads do Flask, alguns logins
+    simultâneos travariam todas as outras requisições. Aqui cada pedido ocupa uma
+    vaga de um semáforo com `pool_size * QUEUE_PER_WORKER` vagas: sem vaga livre,
+    levanta PoolBusy na hora em vez de enfileirar sem limite. A vaga só é
+    devolvida quando o cálculo termina de fato, mesmo que o chamador tenha
+    desistido por timeout (que também vira PoolBusy).
+
+    O pool só é criado no primeiro uso, com processos "spawn": um fork a partir
+    de um processo com várias threads (gthread) poderia herdar locks presos. Se
+    um processo do pool morrer, o pool é recriado e o pedido tentado de novo uma vez.
+    """
+    def __init__(self, pool_size=POOL_SIZE, max_pending=None):
+        self.pool_size = pool_size
+        self.max_pending = max_pending or pool_size * QUEUE_PER_WORKER
+        self._slots = BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = Lock()
+        self._stats = {
+            'completed': 0, 'rejected': 0, 'timed_out': 0, 'pool_restarts': 0,
+            'wait_total_seconds': 0.0, 'wait_max_seconds': 0.0,
+            'compute_total_seconds': 0.0, 'compute_max_seconds': 0.0,
+        }
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise PoolBusy()
+        for attempt in range(2):
+            executor = self._get_executor()
+            submitted = time.time()
+            try:
+                future = executor.submit(_timed, fn, *args)
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                if attempt:
+                    self._slots.release()
+                    raise PoolBusy()
+                continue
+            # A vaga fica ocupada até o processo terminar, não até o chamador desistir
+            future.add_done_callback(lambda _: self._slots.release())
+            try:
+                result, started, compute = future.result(timeout=RESULT_TIMEOUT)
+            except TimeoutError:
+                with self._lock:
+                    self._stats['timed_out'] += 1
+                raise PoolBusy()
+            except BrokenProcessPool:
+                # Um processo do pool morreu; sem recriar o pool, todo login seguinte falharia
+                self._discard_executor(executor)
+                if attempt or not self._slots.acquire(blocking=False):
+                    raise PoolBusy()
+                continue
+            self._record(max(0.0, started - submitted), compute)
+            return result
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.pool_size, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _discard_executor(self, executor):
+        """Descarta um pool quebrado; o próximo _get_executor cria outro."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self._stats['pool_restarts'] += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password)
+
+    def check(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def _record(self, wait, compute):
+        with self._lock:
+            stats = self._stats
+            stats['completed'] += 1
+            stats['wait_total_seconds'] += wait
+            stats['wait_max_seconds'] = max(stats['wait_max_seconds'], wait)
+            stats['compute_total_seconds'] += compute
+            stats['compute_max_seconds'] = max(stats['compute_max_seconds'], compute)
+
+    def stats(self):
+        """Cópia dos contadores, com médias de espera na fila e de cálculo."""
+        with self._lock:
+            stats = dict(self._stats, pool_size=self.pool_size, max_pending=self.max_pending)
+        completed = stats['completed'] or 1
+        stats['wait_avg_seconds'] = stats['wait_total_seconds'] / completed
+        stats['compute_avg_seconds'] = stats['compute_total_seconds'] / completed
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
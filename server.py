@@ -1,133 +1,614 @@
 # server.py
-from flask import Flask, request, jsonify
+from flask import Flask, Blueprint, request, jsonify, g, current_app
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+import logging
 import os
+import secrets
+import threading
+import time
+from functools import wraps
+from datetime import date, timedelta
+from leaderboard import Leaderboard
+from auth_tokens import TokenAuthority, InvalidToken
+from password_pool import PasswordHasher, PoolBusy, POOL_SIZE
+from latency import LatencyHistogram
+from server_logging import configure_logging, LOGGER_NAME
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import database
 
 # --- Configuração ---
 basedir = os.path.abspath(os.path.dirname(__file__))
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'database.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db = SQLAlchemy(app)
+db = SQLAlchemy()
+api = Blueprint('api', __name__)
+log = logging.getLogger(LOGGER_NAME)
+
+# Criados em create_app(), que conhece a configuração
+tokens = None
+password_hasher = None
+latency = LatencyHistogram()
+
+# Limite de sessões por lote em /add_time/batch (mantém o IN (...) abaixo do limite de variáveis do SQLite)
+MAX_BATCH_SIZE = 500
+MAX_SESSION_ID_LENGTH = 64
+ROLLING_DAYS = 365 # Janela do ranking "últimos 365 dias"
+MAX_STATS_DAYS = 3660
+
+def default_config():
+    """Configuração lida do ambiente; create_app(config) sobrescreve chave a chave."""
+    return {
+        # DATABASE_URL troca o SQLite local por um servidor (ex.: postgresql://...)
+        'SQLALCHEMY_DATABASE_URI': os.environ.get('DATABASE_URL') or 'sqlite:///' + os.path.join(basedir, 'database.db'),
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        # /stats e o login leem por um pool separado: no SQLite, conexões só-leitura do mesmo
+        # arquivo; com DATABASE_READ_URL, uma réplica (o login logo após o registro pode falhar
+        # se ela estiver atrasada). Os rankings em memória e tudo que lê o que a própria
+        # requisição acabou de gravar usam o banco principal, para nunca guardar dados velhos.
+        'DATABASE_READ_URL': os.environ.get('DATABASE_READ_URL'),
+        'DB_POOL_SIZE': int(os.environ.get('DB_POOL_SIZE', database.POOL_SIZE)),
+        'DB_READ_POOL_SIZE': int(os.environ.get('DB_READ_POOL_SIZE', database.POOL_SIZE)),
+        'SQLITE_BUSY_TIMEOUT_MS': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', database.BUSY_TIMEOUT_MS)),
+        'SQLITE_TUNING': True, # False só para comparação (db_benchmark.py)
+        # Chave dos tokens de login: precisa ser a mesma em todos os processos e reinícios,
+        # senão os tokens emitidos antes deixam de valer. Sem SECRET_KEY, vale só para este processo.
+        'SECRET_KEY': os.environ.get('SECRET_KEY'),
+        # Hash de senhas fora das threads do Flask (ver password_pool.py)
+        'PASSWORD_POOL_SIZE': int(os.environ.get('PASSWORD_POOL_SIZE', POOL_SIZE)),
+        'PASSWORD_QUEUE_SIZE': int(os.environ.get('PASSWORD_QUEUE_SIZE', 0)) or None, # Padrão: 4 por processo
+        'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'INFO'),
+        'LOG_SAMPLE_RATE': float(os.environ.get('LOG_SAMPLE_RATE', 1.0)), # Fração dos logs por requisição mantida
+        # Rankings são mantidos em memória por processo. Com um único processo (padrão do
+        # gunicorn.conf.py) ficam sempre exatos; com vários, cada um só vê as próprias
+        # escritas, então são recarregados do banco a cada tantos segundos (0 = nunca).
+        'LEADERBOARD_REFRESH_SECONDS': float(os.environ.get('LEADERBOARD_REFRESH_SECONDS', 0)),
+        # /metrics só responde com 'Authorization: Bearer <METRICS_TOKEN>'; sem ele, a rota não existe (404)
+        'METRICS_TOKEN': os.environ.get('METRICS_TOKEN'),
+    }
+
+def create_app(config=None):
+    """Monta a aplicação: `gunicorn -c gunicorn.conf.py wsgi:app` em produção."""
+    global tokens, password_hasher
+    app = Flask(__name__)
+    app.config.update(default_config())
+    app.config.update(config or {})
+    configure_logging(app.config['LOG_LEVEL'], app.config['LOG_SAMPLE_RATE'])
+
+    if not app.config['SECRET_KEY']:
+        log.warning("SECRET_KEY não definida; usando uma chave temporária (tokens expiram ao reiniciar).")
+        app.config['SECRET_KEY'] = secrets.token_hex(32)
+    tokens = TokenAuthority(app.config['SECRET_KEY'])
+    password_hasher = PasswordHasher(app.config['PASSWORD_POOL_SIZE'], app.config['PASSWORD_QUEUE_SIZE'])
+
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    read_uri = app.config['DATABASE_READ_URL'] or uri
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', database.engine_options(uri, app.config['DB_POOL_SIZE']))
+    app.config['SQLALCHEMY_BINDS'] = dict(
+        app.config.get('SQLALCHEMY_BINDS') or {},
+        read=dict(database.engine_options(read_uri, app.config['DB_READ_POOL_SIZE']), url=read_uri)
+    )
+    db.init_app(app)
+    app.register_blueprint(api)
+    app.register_error_handler(PoolBusy, password_pool_busy)
+    app.before_request(start_request_timer)
+    app.after_request(record_request)
+    with app.app_context():
+        # Antes da primeira conexão, para os PRAGMAs valerem em todas
+        if database.is_sqlite(uri) and app.config['SQLITE_TUNING']:
+            database.tune_sqlite(db.engine, app.config['SQLITE_BUSY_TIMEOUT_MS'])
+        if database.is_sqlite(read_uri) and app.config['SQLITE_TUNING']:
+            database.tune_sqlite(db.engines['read'], app.config['SQLITE_BUSY_TIMEOUT_MS'], read_only=True)
+        db.create_all()
+        ensure_indexes()
+    log.info("Aplicação criada", extra={'pid': os.getpid()})
+    return app
+
+def ensure_indexes():
+    """
+    create_all só cria tabelas que não existem; índices declarados depois (ex.: o de
+    User.total_block_seconds) não chegam aos bancos antigos. Cria os que faltarem,
+    com o equivalente portável de CREATE INDEX IF NOT EXISTS.
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+def read_all(statement):
+    """Roda um SELECT no pool de leitura e devolve as linhas. Não enxerga o que não foi commitado."""
+    with db.engines['read'].connect() as connection:
+        return connection.execute(statement).all()
+
+# --- Métricas e log por requisição ---
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+def record_request(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        # Agrupa pela regra da rota (/stats/<username>), não pela URL, para não criar uma série por usuário
+        endpoint = f"{request.method} {request.url_rule.rule if request.url_rule else '<sem rota>'}"
+        latency.observe(endpoint, elapsed)
+        log.info("Requisição", extra={
+            'sampled': True, 'endpoint': endpoint, 'status': response.status_code, 'ms': round(elapsed * 1000, 2)
+        })
+    return response
 
 # --- Modelo do Banco de Dados ---
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
-    total_block_seconds = db.Column(db.Integer, default=0)
+    total_block_seconds = db.Column(db.Integer, default=0, index=True)
+
+class FocusDay(db.Model):
+    # Tempo de foco por usuário e dia; base das estatísticas e do ranking de 365 dias
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    seconds = db.Column(db.Integer, nullable=False, default=0)
+    # A chave primária (user_id, day) atende /stats; este índice atende a expiração da janela por dia
+    __table_args__ = (db.Index('ix_focus_day_day', 'day'),)
+
+class ProcessedSession(db.Model):
+    # Sessões já contabilizadas; permite que o cliente reenvie um lote sem duplicar tempo
+    session_id = db.Column(db.String(MAX_SESSION_ID_LENGTH), primary_key=True)
+    username = db.Column(db.String(80), nullable=False)
+    seconds = db.Column(db.Integer, nullable=False)
+
+# --- Autenticação ---
+def password_pool_busy(e):
+    # Fila de hashing cheia: recusa na hora para o cliente tentar de novo, em vez de acumular threads esperando
+    log.warning("Fila de hash de senhas cheia; retornando 503", extra={'endpoint': request.path})
+    response = jsonify({'message': 'Servidor ocupado, tente novamente em instantes'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+def require_token(view):
+    """Exige 'Authorization: Bearer <token>' e põe o usuário do token em g.user_id / g.username."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not token:
+            return jsonify({'message': 'Token ausente'}), 401
+        try:
+            g.user_id, g.username = tokens.verify(token.strip())
+        except InvalidToken as e:
+            return jsonify({'message': str(e)}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+# --- Ranking em memória ---
+# Mantido incrementalmente em /register e /add_time; carregado do banco na primeira
+# requisição que precisar dele e, se LEADERBOARD_REFRESH_SECONDS > 0, recarregado
+# quando ficar mais velho que isso (vários processos, ver default_config).
+leaderboard = Leaderboard()
+leaderboard_loaded_at = None
+leaderboard_lock = threading.Lock()
+
+def _needs_reload(loaded_at):
+    if loaded_at is None:
+        return True
+    refresh = current_app.config['LEADERBOARD_REFRESH_SECONDS']
+    return refresh > 0 and time.monotonic() - loaded_at >= refresh
+
+def get_leaderboard():
+    global leaderboard_loaded_at
+    with leaderboard_lock:
+        if _needs_reload(leaderboard_loaded_at):
+            leaderboard.load(db.session.execute(db.select(User.username, User.total_block_seconds)).all())
+            leaderboard_loaded_at = time.monotonic()
+            log.debug("Ranking carregado", extra={'period': 'all', 'users': len(leaderboard)})
+    return leaderboard
+
+def _sum_focus_by_user(first_day, end_day=None, usernames=None):
+    """[(username, segundos)] de FocusDay com first_day <= dia (< end_day), opcionalmente só de `usernames`."""
+    query = db.select(User.username, db.func.sum(FocusDay.seconds)).join(FocusDay, FocusDay.user_id == User.id)
+    query = query.where(FocusDay.day >= first_day)
+    if end_day is not None:
+        query = query.where(FocusDay.day < end_day)
+    if usernames is not None:
+        query = query.where(User.username.in_(list(usernames)))
+    return db.session.execute(query.group_by(User.username)).all()
+
+class PeriodLeaderboard:
+    """
+    Ranking de uma janela de dias [window_start(hoje), hoje], mantido como um
+    snapshot em memória: carregado com um SUM uma única vez e depois, a cada
+    add_time, só os usuários afetados têm a soma da janela relida. Quando a janela
+    anda, só os dias que saíram dela são lidos (índice em FocusDay.day) e
+    subtraídos, em vez de refazer o SUM.
+    """
+    def __init__(self, name, window_start):
+        self.name = name
+        self.window_start = window_start # hoje -> primeiro dia da janela
+        self.board = Leaderboard()
+        self.start = None # Primeiro dia contado no snapshot (None = ainda não carregado)
+        self.loaded_at = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        window_start = self.window_start(date.today())
+        with self.lock:
+            if self.start is None or _needs_reload(self.loaded_at):
+                totals = dict(_sum_focus_by_user(window_start))
+                usernames = db.session.execute(db.select(User.username)).scalars().all()
+                self.board.load((username, totals.get(username, 0)) for username in usernames)
+                self.start = window_start
+                self.loaded_at = time.monotonic()
+                log.debug("Ranking carregado", extra={'period': self.name, 'users': len(self.board)})
+            elif window_start > self.start:
+                for username, seconds in _sum_focus_by_user(self.start, window_start):
+                    self.board.add(username, -seconds)
+                self.start = window_start
+        return self.board
+
+    def apply(self, focus_days):
+        """
+        Depois do commit dos (username, dia, segundos) em FocusDay: relê a soma da janela
+        dos usuários afetados, sob self.lock, como push_totals_to_leaderboard. Somar os
+        segundos ao snapshot contaria duas vezes uma linha que uma carga simultânea já leu.
+        """
+        with self.lock:
+            if self.start is None:
+                return # Ainda não carregado: o carregamento já vai somar estas linhas
+            usernames = {username for username, day, _ in focus_days if day >= self.start}
+            if usernames:
+                for username, seconds in _sum_focus_by_user(self.start, usernames=usernames):
+                    self.board.set_total(username, seconds)
+
+    def add_user(self, username):
+        with self.lock:
+            if self.start is not None:
+                self.board.set_total(username, 0)
+
+# Rankings por período (/ranking?period=...); 'all' usa o tempo total de User
+PERIOD_LEADERBOARDS = {
+    'today': PeriodLeaderboard('today', lambda today: today),
+    'week': PeriodLeaderboard('week', lambda today: today - timedelta(days=today.weekday())),
+    f'{ROLLING_DAYS}d': PeriodLeaderboard(f'{ROLLING_DAYS}d', lambda today: today - timedelta(days=ROLLING_DAYS - 1)),
+}
+
+def add_to_user_totals(seconds_per_user):
+    """
+    Soma {username: segundos} a User.total_block_seconds com um UPDATE ... SET total = total + :s,
+    feito pelo banco: threads simultâneas não perdem somas. Não faz commit.
+    """
+    if not seconds_per_user:
+        return
+    users_table = User.__table__
+    db.session.execute(
+        users_table.update()
+        .where(users_table.c.username == db.bindparam('b_username'))
+        .values(total_block_seconds=db.func.coalesce(users_table.c.total_block_seconds, 0) + db.bindparam('b_seconds')),
+        [{'b_username': u, 'b_seconds': sec} for u, sec in seconds_per_user.items()]
+    )
+
+def push_totals_to_leaderboard(usernames):
+    """
+    Depois do commit: lê os totais dos usuários e os põe no ranking em memória.
+    A leitura acontece sob leaderboard_lock, então quem lê depois enxerga pelo menos
+    os commits de quem leu antes, e um total mais velho nunca sobrescreve um mais novo.
+    Retorna {username: total}.
+    """
+    if not usernames:
+        return {}
+    board = get_leaderboard()
+    with leaderboard_lock:
+        totals = dict(db.session.execute(
+            db.select(User.username, User.total_block_seconds).where(User.username.in_(list(usernames)))
+        ).all())
+        for username, total in totals.items():
+            board.set_total(username, total)
+    return totals
+
+# Bancos com INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {'sqlite': sqlite_insert, 'postgresql': postgresql_insert}
+
+def record_focus_days(entries):
+    """
+    Soma segundos em FocusDay para uma lista de (user_id, username, dia, segundos),
+    com somas feitas pelo banco (UPSERT), seguras entre requisições simultâneas. Não faz commit.
+    Retorna [(username, dia, segundos)] agrupados, para atualizar os rankings depois do commit.
+    """
+    grouped = {}
+    for user_id, username, day, seconds in entries:
+        key = (user_id, username, day)
+        grouped[key] = grouped.get(key, 0) + seconds
+    if not grouped:
+        return []
+    rows = [{'user_id': user_id, 'day': day, 'seconds': seconds} for (user_id, _, day), seconds in grouped.items()]
+    insert = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+    if insert is not None:
+        statement = insert(FocusDay)
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=[FocusDay.user_id, FocusDay.day],
+            set_={'seconds': FocusDay.seconds + statement.excluded.seconds}
+        ), rows)
+    else:
+        # Outros bancos: UPDATE atômico e INSERT só para os dias que ainda não tinham linha
+        table = FocusDay.__table__
+        for row in rows:
+            result = db.session.execute(
+                table.update()
+                .where(table.c.user_id == row['user_id'], table.c.day == row['day'])
+                .values(seconds=table.c.seconds + row['seconds'])
+            )
+            if result.rowcount == 0:
+                db.session.execute(table.insert().values(**row))
+    return [(username, day, seconds) for (_, username, day), seconds in grouped.items()]
+
+def apply_to_period_leaderboards(focus_days):
+    for period in PERIOD_LEADERBOARDS.values():
+        period.apply(focus_days)
+
+def valid_seconds(value):
+    """Segundos de foco aceitos: inteiro não negativo (bool é subclasse de int e fica de fora)."""
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+def valid_session_id(value):
+    """Id de sessão aceito: texto não vazio que cabe na coluna de ProcessedSession."""
+    return isinstance(value, str) and 0 < len(value) <= MAX_SESSION_ID_LENGTH
+
+def parse_day(value, default=None):
+    """Data 'AAAA-MM-DD' de um parâmetro; levanta ValueError se inválida."""
+    if value is None:
+        return default
+    return date.fromisoformat(value)
 
 # --- Endpoints da API ---
-@app.route('/register', methods=['POST'])
+@api.route('/register', methods=['POST'])
 def register():
-    print("\n[REGISTRO] Recebida requisição para /register")
+    # Nunca logar o corpo: ele traz a senha
     data = request.get_json()
-    print(f"[REGISTRO] Dados recebidos: {data}")
 
     if not data or not 'username' in data or not 'password' in data:
-        print("[REGISTRO] ERRO: Dados ausentes na requisição.")
+        log.info("Registro com dados ausentes")
         return jsonify({'message': 'Dados ausentes!'}), 400
         
     username = data['username']
     password = data['password']
     
-    print(f"[REGISTRO] Verificando se o usuário '{username}' já existe...")
-    if User.query.filter_by(username=username).first():
-        print(f"[REGISTRO] ERRO: Usuário '{username}' já existe.")
+    if db.session.execute(db.select(User.id).where(User.username == username)).first():
+        log.info("Registro de usuário já existente", extra={'username': username})
         return jsonify({'message': 'Usuário já existe'}), 409
 
-    print(f"[REGISTRO] Usuário '{username}' é novo. Criando hash da senha...")
-    hashed_password = generate_password_hash(password)
+    hashed_password = password_hasher.hash(password)
     new_user = User(username=username, password_hash=hashed_password)
-    
-    print(f"[REGISTRO] Salvando novo usuário '{username}' no banco de dados.")
     db.session.add(new_user)
-    db.session.commit()
-    
-    print("[REGISTRO] Retornando sucesso (201).")
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Outro registro com o mesmo nome entrou entre a checagem e o commit
+        db.session.rollback()
+        log.info("Registro de usuário já existente", extra={'username': username})
+        return jsonify({'message': 'Usuário já existe'}), 409
+    get_leaderboard().set_total(username, 0)
+    for period in PERIOD_LEADERBOARDS.values():
+        period.add_user(username)
+
+    log.info("Usuário registrado", extra={'username': username})
     return jsonify({'message': 'Usuário registrado com sucesso!'}), 201
 
-@app.route('/login', methods=['POST'])
+@api.route('/login', methods=['POST'])
 def login():
-    print("\n[LOGIN] Recebida requisição para /login")
     data = request.get_json()
     
     if not data or not 'username' in data or not 'password' in data:
-        print("[LOGIN] ERRO: Dados ausentes na requisição.")
+        log.info("Login com dados ausentes")
         return jsonify({'message': 'Dados ausentes!'}), 400
 
     username = data['username']
     password = data['password']
-    print(f"[LOGIN] Tentativa de login para usuário: '{username}'")
-
-    print(f"[LOGIN] Buscando usuário '{username}' no banco de dados...")
-    user = User.query.filter_by(username=username).first()
+    # Pool de leitura: nenhuma transação (nem trava) fica aberta durante a verificação da senha
+    rows = read_all(db.select(User.id, User.username, User.password_hash).where(User.username == username))
+    user = rows[0] if rows else None
 
     if not user:
-        print(f"[LOGIN] ERRO: Usuário '{username}' não encontrado.")
+        log.info("Login falhou: usuário não encontrado", extra={'username': username})
         return jsonify({'message': 'Credenciais inválidas'}), 401
     
-    print("[LOGIN] Usuário encontrado. Verificando senha...")
-    if not check_password_hash(user.password_hash, password):
-        print(f"[LOGIN] ERRO: Senha incorreta para o usuário '{username}'.")
+    if not password_hasher.check(user.password_hash, password):
+        log.info("Login falhou: senha incorreta", extra={'username': username})
         return jsonify({'message': 'Credenciais inválidas'}), 401
 
-    print(f"[LOGIN] Senha correta para '{username}'. Login bem-sucedido.")
-    print("[LOGIN] Retornando sucesso (200).")
-    return jsonify({'message': 'Login bem-sucedido'}), 200
+    log.debug("Login bem-sucedido", extra={'username': username})
+    return jsonify({
+        'message': 'Login bem-sucedido',
+        'username': user.username,
+        'token': tokens.issue(user.id, user.username),
+        'expires_in': tokens.max_age
+    }), 200
 
-@app.route('/add_time', methods=['POST'])
+@api.route('/add_time', methods=['POST'])
+@require_token
 def add_time():
-    print("\n[ADD_TIME] Recebida requisição para /add_time")
     data = request.get_json()
-    print(f"[ADD_TIME] Dados recebidos: {data}")
 
-    if not data or not 'username' in data or not 'seconds' in data:
-        print("[ADD_TIME] ERRO: Dados ausentes na requisição.")
+    if not isinstance(data, dict) or not 'seconds' in data:
+        log.info("add_time com dados ausentes", extra={'username': g.username})
         return jsonify({'message': 'Dados ausentes!'}), 400
-        
-    username = data['username']
-    user = User.query.filter_by(username=username).first()
-    
-    if not user:
-        print(f"[ADD_TIME] ERRO: Usuário '{username}' não encontrado.")
+
+    seconds_to_add = data['seconds']
+    if not valid_seconds(seconds_to_add):
+        log.info("add_time com segundos inválidos", extra={'username': g.username})
+        return jsonify({'message': 'Segundos inválidos'}), 400
+
+    # O usuário vem do token; um 'username' no corpo é ignorado
+    username = g.username
+    if db.session.query(User.id).filter_by(id=g.user_id).first() is None:
+        log.warning("add_time para usuário inexistente", extra={'username': username})
         return jsonify({'message': 'Usuário não encontrado'}), 404
-        
-    seconds_to_add = data.get('seconds', 0)
-    print(f"[ADD_TIME] Adicionando {seconds_to_add}s ao total do usuário '{username}'. Total anterior: {user.total_block_seconds}s")
-    
-    user.total_block_seconds += seconds_to_add
+
+    add_to_user_totals({username: seconds_to_add})
+    focus_days = record_focus_days([(g.user_id, username, date.today(), seconds_to_add)])
     db.session.commit()
-    
-    print(f"[ADD_TIME] Salvamento concluído. Novo total: {user.total_block_seconds}s")
-    print("[ADD_TIME] Retornando sucesso (200).")
+    new_total = push_totals_to_leaderboard([username]).get(username)
+    apply_to_period_leaderboards(focus_days)
+
+    log.debug("Tempo adicionado", extra={'username': username, 'seconds': seconds_to_add, 'total': new_total})
     return jsonify({
         'message': 'Tempo adicionado com sucesso', 
-        'new_total_seconds': user.total_block_seconds
+        'new_total_seconds': new_total
+    }), 200
+
+@api.route('/add_time/batch', methods=['POST'])
+@require_token
+def add_time_batch():
+    data = request.get_json()
+
+    if not isinstance(data, dict) or not isinstance(data.get('sessions'), list):
+        log.info("Lote com dados ausentes", extra={'username': g.username})
+        return jsonify({'message': 'Dados ausentes!'}), 400
+
+    if len(data['sessions']) > MAX_BATCH_SIZE:
+        log.info("Lote acima do limite", extra={'username': g.username, 'records': len(data['sessions'])})
+        return jsonify({'message': f'Lote excede o limite de {MAX_BATCH_SIZE} sessões'}), 413
+
+    # Valida e remove duplicatas dentro do próprio lote
+    today = date.today()
+    records = {}
+    for record in data['sessions']:
+        if (not isinstance(record, dict) or not all(k in record for k in ('seconds', 'session_id'))
+                or not valid_seconds(record['seconds']) or not valid_session_id(record['session_id'])):
+            log.info("Registro inválido no lote", extra={'username': g.username})
+            return jsonify({'message': 'Registro inválido no lote'}), 400
+        # 'day' (opcional) é o dia em que a sessão terminou, para envios atrasados caírem no dia certo
+        try:
+            day = parse_day(record.get('day'), today)
+        except (TypeError, ValueError):
+            return jsonify({'message': 'Registro inválido no lote'}), 400
+        records.setdefault(record['session_id'], dict(record, day=min(day, today)))
+
+    try:
+        applied, already_processed, unknown, seconds_per_user, focus_days = apply_batch(records)
+    except IntegrityError:
+        # Outro envio do mesmo lote gravou as sessões entre a checagem e o commit;
+        # refeita, a checagem as encontra e elas voltam como duplicadas
+        db.session.rollback()
+        log.info("Lote concorrente com as mesmas sessões", extra={'username': g.username})
+        applied, already_processed, unknown, seconds_per_user, focus_days = apply_batch(records)
+    apply_to_period_leaderboards(focus_days)
+    new_totals = push_totals_to_leaderboard(seconds_per_user)
+
+    log.debug("Lote processado", extra={
+        'username': g.username, 'applied': len(applied), 'duplicates': len(already_processed), 'unknown_user': len(unknown)
+    })
+    return jsonify({
+        'message': 'Lote processado',
+        'applied': applied,
+        'duplicates': sorted(already_processed),
+        'unknown_user': unknown,
+        'new_totals': new_totals
     }), 200
 
-@app.route('/ranking', methods=['GET'])
+def apply_batch(records):
+    """
+    Grava as sessões de `records` ({session_id: registro}) ainda não processadas, numa transação.
+    Levanta IntegrityError se outra requisição gravou alguma delas antes do commit.
+    """
+    session_ids = list(records)
+    already_processed = {
+        row.session_id for row in
+        ProcessedSession.query.filter(ProcessedSession.session_id.in_(session_ids)).all()
+    } if session_ids else set()
+    # Todas as sessões do lote vão para o usuário do token; 'username' nos registros é ignorado
+    username = g.username
+    user_exists = db.session.query(User.id).filter_by(id=g.user_id).first() is not None
+
+    # Agrupa os segundos: um único UPDATE, uma única transação
+    seconds_per_user = {}
+    day_entries = []
+    applied, unknown = [], []
+    for sid in session_ids:
+        if sid in already_processed:
+            continue
+        record = records[sid]
+        if not user_exists:
+            unknown.append(sid)
+            continue
+        seconds = record['seconds']
+        seconds_per_user[username] = seconds_per_user.get(username, 0) + seconds
+        day_entries.append((g.user_id, username, record['day'], seconds))
+        db.session.add(ProcessedSession(session_id=sid, username=username, seconds=seconds))
+        applied.append(sid)
+
+    add_to_user_totals(seconds_per_user)
+    focus_days = record_focus_days(day_entries)
+    db.session.commit()
+    return applied, already_processed, unknown, seconds_per_user, focus_days
+
+@api.route('/ranking', methods=['GET'])
+@require_token
 def get_ranking():
-    print("\n[RANKING] Recebida requisição para /ranking")
-    print("[RANKING] Buscando e ordenando usuários do banco de dados...")
-    top_users = User.query.order_by(db.desc(User.total_block_seconds)).limit(100).all()
-    print(f"[RANKING] {len(top_users)} usuários encontrados.")
-    
-    ranking_data = []
-    for i, user in enumerate(top_users):
-        ranking_data.append({
-            'rank': i + 1,
-            'username': user.username,
-            'total_seconds': user.total_block_seconds
-        })
-        
-    print("[RANKING] Retornando lista de ranking (200).")
-    return jsonify(ranking_data), 200
+    around = request.args.get('around')
+    # period=all (padrão): tempo total; today, week ou 365d: só o foco dentro da janela
+    period = request.args.get('period', 'all')
+    if period == 'all':
+        board = get_leaderboard()
+    elif period in PERIOD_LEADERBOARDS:
+        board = PERIOD_LEADERBOARDS[period].get()
+    else:
+        return jsonify({'message': 'Período inválido'}), 400
+
+    if around:
+        rank, neighbours = board.around(around)
+        if rank is None:
+            return jsonify({'message': 'Usuário não encontrado'}), 404
+        return jsonify({'rank': rank, 'neighbours': neighbours}), 200
+
+    # Corpo já serializado no snapshot; com If-None-Match igual ao ETag, responde 304 sem corpo
+    etag, body = board.top_snapshot()
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@api.route('/stats/<username>', methods=['GET'])
+def get_stats(username):
+    """Tempo de foco por dia de um usuário entre ?from= e ?to= (padrão: últimos 365 dias)."""
+    try:
+        to_day = parse_day(request.args.get('to'), date.today())
+        from_day = parse_day(request.args.get('from'), to_day - timedelta(days=ROLLING_DAYS - 1))
+    except ValueError:
+        return jsonify({'message': 'Datas devem estar no formato AAAA-MM-DD'}), 400
+    if from_day > to_day or (to_day - from_day).days >= MAX_STATS_DAYS:
+        return jsonify({'message': f'Intervalo inválido (máximo de {MAX_STATS_DAYS} dias)'}), 400
+
+    user_ids = read_all(db.select(User.id).where(User.username == username))
+    if not user_ids:
+        return jsonify({'message': 'Usuário não encontrado'}), 404
+
+    # Varredura de intervalo na chave primária (user_id, day)
+    rows = read_all(db.select(FocusDay.day, FocusDay.seconds).where(
+        FocusDay.user_id == user_ids[0].id, FocusDay.day >= from_day, FocusDay.day <= to_day
+    ).order_by(FocusDay.day))
+    days = {day.isoformat(): seconds for day, seconds in rows}
+    return jsonify({
+        'username': username,
+        'from': from_day.isoformat(),
+        'to': to_day.isoformat(),
+        'days': days,
+        'total_seconds': sum(days.values()),
+    }), 200
+
+@api.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Contadores internos deste processo: latência por endpoint e fila do hash de senhas."""
+    expected = current_app.config['METRICS_TOKEN']
+    if not expected:
+        return jsonify({'message': 'Não encontrado'}), 404
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not secrets.compare_digest(token.strip(), expected):
+        return jsonify({'message': 'Token inválido'}), 401
+    return jsonify({
+        'pid': os.getpid(),
+        'latency': latency.snapshot(),
+        'password_hashing': password_hasher.stats(),
+    }), 200
 
 # --- Ponto de Execução Principal ---
+# Só para desenvolvimento; em produção use wsgi.py com gunicorn.conf.py
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
-    print(">>> Servidor Flask iniciando...")
+    app = create_app()
+    log.info("Servidor Flask de desenvolvimento iniciando")
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,53 @@
+# server_logging.py
+import json
+import logging
+import random
+import sys
+import time
+
+LOGGER_NAME = "hourclass.server"
+# Atributos que todo LogRecord já tem; o resto veio de `extra=` e vira campo do JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "sampled"}
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por evento: ts, level, logger, msg e os campos passados em `extra=`."""
+    def format(self, record):
+        entry = {
+            'ts': time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Deixa passar só uma fração `rate` dos eventos marcados com extra={'sampled': True}
+    (ex.: o log de cada requisição). Avisos e erros nunca são descartados.
+    """
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not getattr(record, 'sampled', False):
+            return True
+        return random.random() < self.rate
+
+def configure_logging(level="INFO", sample_rate=1.0):
+    """Manda os logs do servidor para stderr, em JSON. Chamado por create_app()."""
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    logger.propagate = False
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(JsonFormatter())
+        logger.addHandler(handler)
+    for handler in logger.handlers:
+        handler.filters = [SamplingFilter(sample_rate)]
+    return logger
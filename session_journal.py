@@ -0,0 +1,156 @@
+# session_journal.py
+import json
+import os
+import tempfile
+import time
+
+# Segundos entre fsyncs de checkpoints; início/fim não esperam. Com um checkpoint a cada
+# 30 s (CHECKPOINT_INTERVAL_MS no main.py), um em cada quatro vai para o disco
+FSYNC_INTERVAL = 120
+
+class SessionJournal:
+    """
+    Diário local, só de acréscimos, das sessões de foco (uma linha JSON por evento):
+
+        {"type": "start", "id", "user", "started_at", "planned", "room"}
+        {"type": "checkpoint", "id", "elapsed"}
+        {"type": "end", "id", "user", "started_at", "ended_at", "seconds", "room"}
+        {"type": "abort", "id"}        sessão cancelada, não conta tempo
+        {"type": "ack", "ids": [...]}  sessões que o servidor confirmou
+
+    Início e fim vão para o disco na hora (fsync). Checkpoints vão para o sistema
+    operacional na hora (flush), o que basta se só o app morrer, mas só forçam o
+    fsync quando o último tiver mais de FSYNC_INTERVAL: numa queda de energia,
+    perde-se no máximo esse tempo. Se o app morrer no meio de uma sessão,
+    replay() a encerra com o tempo do último checkpoint, e os eventos "end" sem
+    "ack" formam a fila de envio ao servidor.
+    """
+    def __init__(self, path, fsync_interval=FSYNC_INTERVAL):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._last_fsync = 0.0
+        self._dirty = False
+        self._sessions = {} # id -> evento "end" ainda não confirmado pelo servidor
+
+    def _append(self, event, sync):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(event, separators=(',', ':')) + "\n")
+        self._file.flush()
+        self._dirty = True
+        if sync or time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """Força para o disco o que já foi escrito."""
+        if self._file is not None and self._dirty:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+            self._last_fsync = time.monotonic()
+
+    def start(self, session_id, username, planned_seconds, room=None, started_at=None):
+        self._append({
+            'type': 'start', 'id': session_id, 'user': username,
+            'started_at': started_at or time.time(), 'planned': planned_seconds, 'room': room
+        }, sync=True)
+
+    def checkpoint(self, session_id, elapsed_seconds):
+        self._append({'type': 'checkpoint', 'id': session_id, 'elapsed': int(elapsed_seconds)}, sync=False)
+
+    def end(self, session_id, username, started_at, ended_at, seconds, room=None):
+        """Registra o fim da sessão; a partir daqui ela fica na fila de envio até o ack."""
+        event = {
+            'type': 'end', 'id': session_id, 'user': username, 'started_at': started_at,
+            'ended_at': ended_at, 'seconds': int(seconds), 'room': room
+        }
+        self._append(event, sync=True)
+        self._sessions[session_id] = event
+        return event
+
+    def abort(self, session_id):
+        self._append({'type': 'abort', 'id': session_id}, sync=True)
+
+    def ack(self, session_ids):
+        """Marca as sessões como recebidas pelo servidor, tirando-as da fila."""
+        session_ids = [sid for sid in session_ids if sid in self._sessions]
+        if not session_ids:
+            return
+        self._append({'type': 'ack', 'ids': session_ids}, sync=False)
+        for sid in session_ids:
+            del self._sessions[sid]
+
+    def pending(self):
+        """Sessões encerradas ainda não confirmadas, da mais antiga para a mais nova."""
+        return list(self._sessions.values())
+
+    def replay(self):
+        """
+        Lê o diário na inicialização. Sessões abertas (app fechado à força) são
+        encerradas com o tempo do último checkpoint. Reescreve o arquivo só com as
+        sessões pendentes e retorna a lista das que foram recuperadas agora.
+        """
+        open_sessions = {}
+        ended = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    # Linhas cortadas por um crash no meio da escrita, ou sem os campos esperados, são ignoradas
+                    try:
+                        event = json.loads(line)
+                        kind = event['type']
+                        if kind == 'start':
+                            open_sessions[event['id']] = dict(event, elapsed=0)
+                        elif kind == 'checkpoint' and event['id'] in open_sessions:
+                            open_sessions[event['id']]['elapsed'] = event['elapsed']
+                        elif kind == 'end':
+                            open_sessions.pop(event['id'], None)
+                            ended[event['id']] = event
+                        elif kind == 'abort':
+                            open_sessions.pop(event['id'], None)
+                        elif kind == 'ack':
+                            for sid in event['ids']:
+                                ended.pop(sid, None)
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+
+        recovered = []
+        for sid, start in open_sessions.items():
+            seconds = min(start['elapsed'], start['planned'])
+            if seconds <= 0:
+                continue
+            event = {
+                'type': 'end', 'id': sid, 'user': start['user'], 'started_at': start['started_at'],
+                'ended_at': start['started_at'] + seconds, 'seconds': seconds, 'room': start.get('room')
+            }
+            ended[sid] = event
+            recovered.append(event)
+
+        self._sessions = ended
+        self._rewrite(ended.values())
+        return recovered
+
+    def _rewrite(self, events):
+        """Compacta o diário: temporário + fsync + rename, como o HostsManager faz com o hosts."""
+        self.close()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix=".journal.", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for event in events:
+                    f.write(json.dumps(event, separators=(',', ':')) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
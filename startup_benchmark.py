@@ -0,0 +1,86 @@
+# startup_benchmark.py
+"""
+Compara o custo de inicialização dos dois backends da ampulheta
+(hourglass_view.py): tempo até a animação estar pronta e memória (RSS) do
+processo somada à de seus filhos (o QtWebEngineProcess, no caso do WebEngine).
+
+    python startup_benchmark.py            # roda os dois backends
+    python startup_benchmark.py native     # só um
+
+Cada medição roda em um processo novo, para que um backend não aqueça o outro.
+A soma da memória dos filhos usa /proc e só funciona no Linux; nos outros
+sistemas é mostrada apenas a memória do próprio processo.
+"""
+import os
+import subprocess
+import sys
+import time
+
+RUNS = 3
+
+def _rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+def _tree_rss_kb(pid):
+    return _rss_kb(pid) + sum(_tree_rss_kb(child) for child in _children(pid))
+
+def measure(backend):
+    """Roda dentro do processo filho: cria o widget, espera o 'loaded' e imprime os números."""
+    started = time.perf_counter()
+    from PyQt6.QtCore import Qt, QTimer
+    from PyQt6.QtWidgets import QApplication
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv)
+
+    from hourglass_view import create_hourglass_view
+    view = create_hourglass_view(backend=backend)
+    view.resize(300, 300)
+    view.show()
+
+    def on_loaded():
+        view.play()
+        # Deixa a animação rodar um pouco para que os quadros/páginas sejam de fato criados
+        QTimer.singleShot(2000, report)
+
+    def report():
+        ready_seconds = loaded_at[0] - started
+        rss_mb = (_tree_rss_kb(os.getpid()) or _self_max_rss_kb()) / 1024
+        print(f"{type(view).__name__}: pronto em {ready_seconds:.2f}s, memória {rss_mb:.0f} MB")
+        app.quit()
+
+    loaded_at = []
+    view.loaded.connect(lambda: (loaded_at.append(time.perf_counter()), on_loaded()))
+    app.exec()
+
+def _self_max_rss_kb():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        return 0
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        measure(sys.argv[2])
+        sys.exit(0)
+
+    backends = sys.argv[1:] or ["webengine", "native"]
+    for backend in backends:
+        print(f"--- {backend} ({RUNS} execuções) ---")
+        for _ in range(RUNS):
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--child", backend],
+                           cwd=os.path.dirname(os.path.abspath(__file__)))
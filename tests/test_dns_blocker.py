@@ -0,0 +1,109 @@
+import os
+import socket
+import struct
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dns_blocker
+
+UPSTREAM_IP = "93.184.216.34"
+
+
+class FakeUpstream:
+    """Resolvedor UDP falso: responde todo nome com UPSTREAM_IP e conta as consultas recebidas."""
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.address = self.sock.getsockname()
+        self.queries = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                query, client = self.sock.recvfrom(4096)
+            except OSError:
+                return
+            _, _, name, qtype, _, question_end = dns_blocker.parse_question(query)
+            self.queries.append(name)
+            rdata = socket.inet_aton(UPSTREAM_IP)
+            answer = struct.pack("!HHHIH", 0xC00C, qtype, dns_blocker.CLASS_IN, 300, len(rdata)) + rdata
+            self.sock.sendto(dns_blocker.build_response(query, question_end, answer=answer), client)
+
+    def close(self):
+        self.sock.close()
+
+
+def build_query(name, txid=0x1234):
+    question = b"".join(bytes([len(label)]) + label.encode() for label in name.split(".")) + b"\0"
+    return struct.pack("!HHHHHH", txid, 0x0100, 1, 0, 0, 0) + question + struct.pack("!HH", dns_blocker.TYPE_A, dns_blocker.CLASS_IN)
+
+
+def lookup(address, name, txid=0x1234):
+    """Consulta A pelo resolvedor; retorna (id da resposta, IP da resposta)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(2)
+        sock.sendto(build_query(name, txid), address)
+        response, _ = sock.recvfrom(4096)
+    return struct.unpack("!H", response[:2])[0], socket.inet_ntoa(response[-4:])
+
+
+@pytest.fixture
+def resolver():
+    upstream = FakeUpstream()
+    dns_server, control_server = dns_blocker.serve(("127.0.0.1", 0), upstream.address, ("127.0.0.1", 0))
+    yield upstream, dns_server.server_address, control_server.server_address
+    dns_server.shutdown()
+    control_server.shutdown()
+    dns_server.server_close()
+    control_server.server_close()
+    upstream.close()
+
+
+def test_blocked_names_get_redirect_ip(resolver):
+    upstream, dns_address, control_address = resolver
+    dns_blocker.send_blocklist(control_address, ["*.ads.org", "tracker.com"], True)
+
+    for name in ("ads.org", "x.ads.org", "tracker.com", "cdn.tracker.com"):
+        assert lookup(dns_address, name)[1] == "127.0.0.1"
+    assert upstream.queries == []
+
+
+def test_other_names_are_forwarded_and_cached(resolver):
+    upstream, dns_address, control_address = resolver
+    dns_blocker.send_blocklist(control_address, ["tracker.com"], True)
+
+    assert lookup(dns_address, "example.com", txid=1) == (1, UPSTREAM_IP)
+    # A repetição vem do cache, com o ID da nova consulta
+    assert lookup(dns_address, "example.com", txid=2) == (2, UPSTREAM_IP)
+    assert upstream.queries == ["example.com"]
+
+
+def test_control_port_swaps_blocklist(resolver):
+    upstream, dns_address, control_address = resolver
+    dns_blocker.send_blocklist(control_address, ["a.com"], True)
+    assert lookup(dns_address, "a.com")[1] == "127.0.0.1"
+
+    dns_blocker.send_blocklist(control_address, ["b.com"], True)
+    assert lookup(dns_address, "a.com")[1] == UPSTREAM_IP
+    assert lookup(dns_address, "b.com")[1] == "127.0.0.1"
+
+    # Desligar e religar sem mandar a lista mantém a mesma trie
+    dns_blocker.send_blocklist(control_address, None, False)
+    assert lookup(dns_address, "www.b.com")[1] == UPSTREAM_IP
+    dns_blocker.send_blocklist(control_address, None, True)
+    assert lookup(dns_address, "b.com")[1] == "127.0.0.1"
+
+
+def test_toggle_keeps_built_trie():
+    resolver = dns_blocker.BlockingResolver(("127.0.0.1", 9))
+    resolver.set_blocklist(["a.com", "b.com"], True)
+    trie = resolver.blocklist
+    resolver.set_blocklist(None, False)
+    assert resolver.blocklist is None
+    resolver.set_blocklist(["a.com", "b.com"], True)
+    assert resolver.blocklist is trie
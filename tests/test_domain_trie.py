@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from domain_trie import DomainTrie, iter_blocklist_file
+
+
+def parse(tmp_path, text):
+    path = tmp_path / "lista.txt"
+    path.write_text(text, encoding="utf-8")
+    return list(iter_blocklist_file(str(path)))
+
+
+def test_adblock_cosmetic_and_exception_rules_are_skipped(tmp_path):
+    entries = parse(tmp_path, "\n".join([
+        "youtube.com##.ad-banner",
+        "news.site.org#@#.promo",
+        "example.com#?#div:-abp-has(.ad)",
+        "example.net#$#abort-on-property-read x",
+        "shop.example.com#@?#.banner",
+        "@@||allowed.com^",
+    ]))
+    assert entries == []
+
+
+def test_hash_comments(tmp_path):
+    entries = parse(tmp_path, "\n".join([
+        "# comentário inteiro",
+        "0.0.0.0 ads.example.com # rastreador",
+        "tracker.example.org\t#comentário depois de tab",
+    ]))
+    assert entries == ["ads.example.com", "tracker.example.org"]
+
+
+def test_supported_formats(tmp_path):
+    entries = parse(tmp_path, "\n".join([
+        "! comentário do Adblock",
+        "[Adblock Plus 2.0]",
+        "127.0.0.1 localhost",
+        "0.0.0.0 a.com b.com",
+        "||ads.net^",
+        "||ads.org^$third-party",
+        "https://www.Site.com/caminho",
+    ]))
+    assert entries == ["a.com", "b.com", "*.ads.net", "ads.net", "www.site.com"]
+
+
+def test_wildcard_blocks_apex_when_including_subdomains():
+    # Mesma regra do HostsManager: "*.foo.org" também bloqueia foo.org
+    trie = DomainTrie(["*.foo.org", "bar.org"], include_subdomains=True)
+    for name in ("foo.org", "www.foo.org", "a.b.foo.org", "bar.org", "m.bar.org"):
+        assert trie.matches(name)
+    assert not trie.matches("otherfoo.org")
+    assert not trie.matches("org")
@@ -0,0 +1,5 @@
+# wsgi.py
+# Ponto de entrada de produção: gunicorn -c gunicorn.conf.py wsgi:app
+from server import create_app
+
+app = create_app()